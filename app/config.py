@@ -1,6 +1,6 @@
 # Environment configuration
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Literal
 import os
 
 
@@ -26,7 +26,75 @@ class Settings(BaseSettings):
     
     # Static files configuration
     static_files_path: str = "app/static"
-    
+    static_memory_cache_max_bytes: int = 512 * 1024  # Larger files are served from a cached fd
+
+    # Contact archival / retention configuration
+    archive_enabled: bool = False
+    archive_backend: Literal["collection", "file"] = "collection"
+    archive_after_days: int = 180
+    archive_batch_size: int = 500
+    archive_batch_pause_seconds: float = 1.0  # Throttle between batches
+    archive_interval_seconds: int = 3600  # Time between archival passes
+    archive_collection_name: str = "contacts_archive"
+    archive_dir: str = "archive"
+
+    # Contact notification configuration
+    notification_queue_size: int = 1000  # Pending jobs per sink
+    notification_sink_concurrency: int = 2  # Workers (max in-flight deliveries) per sink
+    notification_max_attempts: int = 5
+    notification_backoff_base_seconds: float = 1.0
+    notification_backoff_max_seconds: float = 60.0
+    notification_dead_letter_collection: str = "notification_dead_letters"
+    notification_webhook_urls: List[str] = []
+    notification_webhook_timeout_seconds: float = 5.0
+    notification_smtp_host: str = ""
+    notification_smtp_port: int = 25
+    notification_email_from: str = ""
+    notification_email_to: str = ""
+
+    # Request tracing configuration
+    tracing_server_timing: bool = False  # Emit Server-Timing headers on every response
+    tracing_sample_rate: float = 0.0  # Fraction of requests exported
+    tracing_export_path: str = ""  # NDJSON file for sampled traces
+    tracing_otlp_endpoint: str = ""  # e.g. http://localhost:4318/v1/traces
+    tracing_service_name: str = "portfolio-backend"
+
+    # Admission control / load shedding configuration
+    admission_enabled: bool = True
+    admission_retry_after_seconds: int = 1
+    # DB-bound routes (contact form and admin)
+    admission_db_initial_limit: int = 10
+    admission_db_min_limit: int = 2
+    admission_db_max_limit: int = 40
+    admission_db_latency_target_seconds: float = 0.5
+    admission_db_queue_timeout_seconds: float = 0.5
+    admission_db_max_queue: int = 50
+    # Static file routes
+    admission_static_initial_limit: int = 100
+    admission_static_min_limit: int = 10
+    admission_static_max_limit: int = 1000
+    admission_static_latency_target_seconds: float = 0.1
+    admission_static_queue_timeout_seconds: float = 0.2
+    admission_static_max_queue: int = 200
+
+    # Database circuit breaker configuration
+    db_call_timeout_seconds: float = 5.0
+    db_breaker_failure_threshold: int = 5  # Consecutive failures before opening
+    db_breaker_reset_timeout_seconds: float = 10.0
+
+    # Diagnostics endpoint configuration (admin only, off by default)
+    diagnostics_enabled: bool = False
+    diagnostics_token: str = ""  # Required in the X-Diagnostics-Token header
+    diagnostics_dir: str = "diagnostics"  # Where CPU profiles are written
+
+    # Bulk contact import configuration
+    import_batch_size: int = 1000
+    import_concurrency: int = 2  # Batches inserted in parallel
+    import_max_concurrency: int = 3  # Cap for the query parameter, well below maxPoolSize (10)
+    import_batch_timeout_seconds: float = 60.0  # Per insert_many deadline (replaces DB_CALL_TIMEOUT_SECONDS)
+    import_max_errors: int = 1000  # Per-record errors included in the report
+    import_max_record_bytes: int = 64 * 1024
+
     class Config:
         env_file = ".env"
         case_sensitive = False
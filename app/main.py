@@ -2,20 +2,25 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
 import logging
 import uvicorn
-from pathlib import Path
 import os
 
 # Import configuration and services
 from app.config import settings
-from app.services.db import connect_to_mongo, close_mongo_connection
+from app.services.db import connect_to_mongo, close_mongo_connection, db_breaker
+from app.services.archive import start_archiver, stop_archiver
+from app.services.notifications import start_notification_workers, stop_notification_workers
+from app.services.tracing import TracingMiddleware
+from app.services.static_files import StaticFilesMiddleware
+from app.services.admission import AdmissionControlMiddleware, CircuitOpenError, build_limiters
+from app.services.diagnostics import loop_monitor
 
 # Import routes
 from app.routes.contact import router as contact_router
-from app.routes.static import router as static_router
+from app.routes.static import router as static_router, static_table
 from app.routes.health import router as health_router
+from app.routes.diagnostics import router as diagnostics_router
 
 # Configure logging
 logging.basicConfig(
@@ -33,6 +38,30 @@ app = FastAPI(
     redoc_url="/redoc" if settings.is_development else None,
 )
 
+# Serve static files (/static/... and the resume/certification API URLs)
+# from the startup-built route table, ahead of routing
+app.add_middleware(StaticFilesMiddleware, table=static_table)
+
+# Concurrency limits per route class, shedding excess load with 503
+def classify_route(path: str):
+    """Map a request path to its admission route class"""
+    if path in static_table.routes:
+        return "static"
+    if path == f"{settings.api_v1_str}/contact/admin/import":
+        # Long-running; bounded by its own batch concurrency instead
+        return None
+    if path.startswith(f"{settings.api_v1_str}/contact") and path != f"{settings.api_v1_str}/contact/health":
+        return "db"
+    return None
+
+admission_limiters = build_limiters()
+app.add_middleware(
+    AdmissionControlMiddleware,
+    classify=classify_route,
+    limiters=admission_limiters,
+    breaker=db_breaker
+)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -43,30 +72,25 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-# Mount static files (for direct file access)
-BASE_DIR = Path(__file__).resolve().parent
-static_path = BASE_DIR / "static"
-if static_path.exists():
-    app.mount(
-        "/static",
-        StaticFiles(
-            directory=str(static_path),
-            html=False
-        ),
-        name="static"
-    )
+# Request tracing (Server-Timing headers and sampled trace export)
+app.add_middleware(TracingMiddleware)
 
 # Include routers
 app.include_router(contact_router, prefix=settings.api_v1_str, tags=["Contact"])
 app.include_router(static_router, prefix=settings.api_v1_str, tags=["Static Files"])
 app.include_router(health_router, prefix=settings.api_v1_str, tags=["Health"])
+app.include_router(diagnostics_router, prefix=settings.api_v1_str, tags=["Diagnostics"])
 
 # Database event handlers
 @app.on_event("startup")
 async def startup_event():
     """Initialize database connection on startup"""
     try:
+        # Rebuild the static route table if a previous shutdown closed it
+        static_table.open()
         await connect_to_mongo()
+        start_archiver()
+        await start_notification_workers()
         logger.info("Application startup completed successfully")
     except Exception as e:
         logger.error(f"Failed to start application: {e}")
@@ -75,9 +99,25 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Close database connection on shutdown"""
+    await stop_archiver()
+    await stop_notification_workers()
     await close_mongo_connection()
+    static_table.close()
+    loop_monitor.stop()
     logger.info("Application shutdown completed")
 
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    """Fail fast while the database circuit is open"""
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": str(exc.retry_after)},
+        content={
+            "error": "Service temporarily unavailable",
+            "message": "The database is temporarily unavailable. Please try again shortly."
+        }
+    )
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -113,7 +153,9 @@ async def health_check():
     return {
         "status": "healthy",
         "environment": settings.environment,
-        "database": "connected" if settings.mongodb_uri else "not configured"
+        "database": "connected" if settings.mongodb_uri else "not configured",
+        "database_circuit": db_breaker.snapshot(),
+        "admission": {name: limiter.snapshot() for name, limiter in admission_limiters.items()}
     }
 
 # API v1 root
@@ -1,9 +1,14 @@
 # Contact form endpoints
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from fastapi.responses import JSONResponse
+from pymongo.errors import PyMongoError
 from app.models import ContactFormRequest, ContactFormResponse, ContactDocument
 from app.services.db import insert_contact
+from app.services.notifications import notify_new_contact
+from app.services.tracing import span, traced
+from app.services.admission import CircuitOpenError
 from datetime import datetime
+from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,6 +16,7 @@ router = APIRouter()
 
 
 @router.post("/contact", response_model=ContactFormResponse)
+@traced("contact.submit")
 async def submit_contact_form(
     contact_request: ContactFormRequest,
     request: Request
@@ -28,23 +34,27 @@ async def submit_contact_form(
         client_ip = request.client.host if request.client else "unknown"
         user_agent = request.headers.get("user-agent", "unknown")
         
-        # Create contact document
-        contact_doc = ContactDocument(
-            name=contact_request.name,
-            email=contact_request.email,
-            subject=contact_request.subject,
-            message=contact_request.message,
-            created_at=datetime.utcnow(),
-            ip_address=client_ip,
-            user_agent=user_agent
-        )
-        
-        # Convert to dict for MongoDB insertion
-        contact_dict = contact_doc.dict()
+        with span("contact.build_document"):
+            # Create contact document
+            contact_doc = ContactDocument(
+                name=contact_request.name,
+                email=contact_request.email,
+                subject=contact_request.subject,
+                message=contact_request.message,
+                created_at=datetime.utcnow(),
+                ip_address=client_ip,
+                user_agent=user_agent
+            )
+            
+            # Convert to dict for MongoDB insertion
+            contact_dict = contact_doc.dict()
         
         # Insert into database
         contact_id = await insert_contact(contact_dict)
         
+        # Queue notifications off the response path
+        notify_new_contact(contact_id, contact_dict)
+        
         logger.info(f"Contact form submitted successfully. ID: {contact_id}, Email: {contact_request.email}")
         
         return ContactFormResponse(
@@ -53,7 +63,17 @@ async def submit_contact_form(
             id=contact_id
         )
         
+    except CircuitOpenError:
+        raise
     except Exception as e:
+        if isinstance(e, PyMongoError) and e.timeout:
+            # The insert may have been applied; resubmitting could store it twice
+            logger.warning(f"Contact form insert timed out, outcome unknown: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="The request timed out and your message may already have been received. "
+                       "Please wait a few minutes before submitting again."
+            )
         logger.error(f"Error processing contact form: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -69,6 +89,7 @@ async def contact_health():
 
 # Optional: Admin endpoint to get contacts (add authentication in production)
 @router.get("/contact/admin/all")
+@traced("contact.admin_all")
 async def get_all_contacts_admin(skip: int = 0, limit: int = 50):
     """
     Admin endpoint to get all contacts
@@ -89,9 +110,112 @@ async def get_all_contacts_admin(skip: int = 0, limit: int = 50):
             "limit": limit
         }
         
+    except CircuitOpenError:
+        raise
     except Exception as e:
         logger.error(f"Error getting contacts: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while retrieving contacts."
-        )
\ No newline at end of file
+        )
+
+# Read-only access to archived contacts (add authentication in production)
+@router.get("/contact/admin/archive")
+async def get_archived_contacts_admin(skip: int = 0, limit: int = 50):
+    """
+    Admin endpoint to get archived contacts (read-only)
+    Note: In production, this should be protected with authentication
+    """
+    try:
+        from app.services.archive import get_archived_contacts
+        contacts = await get_archived_contacts(skip=skip, limit=limit)
+
+        # Convert ObjectId to string for JSON serialization
+        for contact in contacts:
+            contact["_id"] = str(contact["_id"])
+
+        return {
+            "contacts": contacts,
+            "total": len(contacts),
+            "skip": skip,
+            "limit": limit
+        }
+
+    except Exception as e:
+        logger.error(f"Error getting archived contacts: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while retrieving archived contacts."
+        )
+
+
+@router.get("/contact/admin/archive/status")
+async def get_archive_status_admin():
+    """Admin endpoint reporting the state of the background archiver"""
+    from app.config import settings
+    from app.services.archive import archiver_state
+    return {
+        "enabled": settings.archive_enabled,
+        "running": archiver_state.task is not None and not archiver_state.task.done(),
+        "backend": settings.archive_backend,
+        "archive_after_days": settings.archive_after_days,
+        "last_run_at": archiver_state.last_run_at,
+        "last_run_archived": archiver_state.last_run_archived,
+        "total_archived": archiver_state.total_archived
+    }
+
+
+# Bulk import of historical contacts (add authentication in production)
+@router.post("/contact/admin/import")
+async def import_contacts_admin(
+    request: Request,
+    file_format: Optional[str] = Query(None, alias="format"),
+    batch_size: Optional[int] = Query(None, ge=1, le=10000),
+    concurrency: Optional[int] = Query(None, ge=1)
+):
+    """
+    Admin endpoint to bulk import contacts from an NDJSON or CSV request body
+    
+    - **format**: `ndjson` or `csv` (defaults from the Content-Type header)
+    - **batch_size**: Records per `insert_many` batch
+    - **concurrency**: Batches inserted in parallel (capped by `IMPORT_MAX_CONCURRENCY`)
+    
+    Records use the contact form fields, plus optional `created_at`,
+    `ip_address` and `user_agent`. CSV uploads need a header row.
+    Note: In production, this should be protected with authentication
+    """
+    from app.config import settings
+    from app.services.contact_import import IMPORT_FORMATS, import_contacts, import_state
+
+    if file_format is None:
+        content_type = request.headers.get("content-type", "")
+        file_format = "csv" if "csv" in content_type else "ndjson"
+    if file_format not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format. Use one of: {', '.join(IMPORT_FORMATS)}"
+        )
+    if import_state.running:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another import is already running. Please try again when it has finished."
+        )
+
+    try:
+        report = await import_contacts(
+            request.stream(),
+            file_format,
+            batch_size=batch_size or settings.import_batch_size,
+            # Keep imports to a small share of the connection pool
+            concurrency=min(concurrency or settings.import_concurrency, settings.import_max_concurrency)
+        )
+        if report["aborted"]:
+            # Unreadable upload; the report still says what was imported
+            return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=report)
+        return report
+    except Exception as e:
+        logger.error(f"Error importing contacts: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while importing contacts."
+        )
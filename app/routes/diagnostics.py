@@ -0,0 +1,123 @@
+# Admin-only runtime diagnostics endpoints
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from typing import Optional
+import asyncio
+import logging
+import secrets
+import threading
+from app.config import settings
+from app.services import diagnostics
+
+logger = logging.getLogger(__name__)
+
+
+async def require_diagnostics_access(x_diagnostics_token: Optional[str] = Header(None)):
+    """Hide diagnostics unless enabled, and require the admin token"""
+    if not settings.diagnostics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not settings.diagnostics_token or not x_diagnostics_token or not secrets.compare_digest(
+        x_diagnostics_token, settings.diagnostics_token
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid diagnostics token")
+
+
+router = APIRouter(dependencies=[Depends(require_diagnostics_access)])
+
+
+@router.get("/diagnostics")
+async def diagnostics_status():
+    """Current state of all diagnostics"""
+    return {
+        "tracemalloc": diagnostics.tracemalloc_status(),
+        "gc": diagnostics.gc_stats(),
+        "loop": diagnostics.loop_monitor.stats(),
+    }
+
+
+@router.post("/diagnostics/tracemalloc/start")
+async def tracemalloc_start(frames: int = Query(10, ge=1, le=diagnostics.MAX_TRACEMALLOC_FRAMES)):
+    """Start allocation tracing"""
+    diagnostics.start_tracemalloc(frames)
+    return diagnostics.tracemalloc_status()
+
+
+@router.post("/diagnostics/tracemalloc/stop")
+async def tracemalloc_stop():
+    """Stop allocation tracing"""
+    diagnostics.stop_tracemalloc()
+    return diagnostics.tracemalloc_status()
+
+
+@router.post("/diagnostics/tracemalloc/snapshots")
+async def tracemalloc_snapshot():
+    """Store a snapshot to diff against later"""
+    # Snapshots, grouping and diffs walk every traced block; keep them off the event loop
+    try:
+        return {"id": await asyncio.to_thread(diagnostics.take_snapshot)}
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.get("/diagnostics/tracemalloc/top")
+async def tracemalloc_top(limit: int = Query(20, ge=1), group_by: diagnostics.GroupBy = "lineno"):
+    """Top allocation sites"""
+    try:
+        return {"top": await asyncio.to_thread(diagnostics.top_allocations, limit, group_by)}
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.get("/diagnostics/tracemalloc/diff")
+async def tracemalloc_diff(base: int, target: Optional[int] = None, limit: int = Query(20, ge=1),
+                           group_by: diagnostics.GroupBy = "lineno"):
+    """Allocation growth between two snapshots (or a snapshot and now)"""
+    try:
+        return {"diff": await asyncio.to_thread(diagnostics.diff_snapshots, base, target, limit, group_by)}
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Snapshot not found")
+
+
+@router.get("/diagnostics/gc")
+async def gc_status(object_types: int = Query(0, ge=0, le=diagnostics.MAX_OBJECT_TYPES)):
+    """Garbage collector statistics"""
+    if not object_types:
+        return diagnostics.gc_stats()
+    # Counting live objects walks the whole heap; keep it off the event loop
+    return await asyncio.to_thread(diagnostics.gc_stats, object_types)
+
+
+@router.post("/diagnostics/gc/collect")
+async def gc_collect():
+    """Force a full garbage collection"""
+    return diagnostics.gc_collect()
+
+
+@router.post("/diagnostics/loop/start")
+async def loop_monitor_start(interval: float = Query(0.1, gt=0),
+                             slow_callback_ms: Optional[float] = Query(None, gt=0)):
+    """Start event loop lag monitoring (and slow-callback detection if given a threshold)"""
+    diagnostics.loop_monitor.start(interval=interval, slow_callback_ms=slow_callback_ms)
+    return diagnostics.loop_monitor.stats()
+
+
+@router.post("/diagnostics/loop/stop")
+async def loop_monitor_stop():
+    """Stop event loop monitoring"""
+    diagnostics.loop_monitor.stop()
+    return diagnostics.loop_monitor.stats()
+
+
+@router.post("/diagnostics/profile")
+async def cpu_profile(seconds: float = 10.0, interval_ms: float = 5.0, top: int = 20):
+    """Sample the event loop thread's CPU profile and dump it to disk"""
+    if not 0 < seconds <= 120 or interval_ms <= 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid profile duration")
+    loop_thread_id = threading.get_ident()
+    try:
+        return await asyncio.to_thread(
+            diagnostics.run_cpu_profile, loop_thread_id, seconds, interval_ms / 1000, top
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
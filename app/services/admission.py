@@ -0,0 +1,283 @@
+# Adaptive admission control, load shedding and circuit breaking
+import asyncio
+import functools
+import json
+import logging
+import math
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limiter whose limit adapts to observed latency (AIMD)
+    The limit grows by roughly one per window of fast completions while it
+    is saturated, and is cut multiplicatively when latency exceeds the
+    target or requests fail. Requests over the limit wait in a bounded
+    queue until their queue-time deadline, then are shed.
+    """
+
+    def __init__(self, name: str, initial_limit: int, min_limit: int, max_limit: int,
+                 latency_target: float, queue_timeout: float, max_queue: int,
+                 decrease_ratio: float = 0.7):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.decrease_ratio = decrease_ratio
+        self.in_flight = 0
+        self.waiters: deque = deque()
+        self.last_decrease = 0.0
+        self.stats = {"admitted": 0, "queued": 0, "shed": 0}
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < max(int(self.limit), self.min_limit)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting up to the queue deadline; False means shed"""
+        if self._has_capacity() and not self.waiters:
+            self.in_flight += 1
+            self.stats["admitted"] += 1
+            return True
+
+        if len(self.waiters) >= self.max_queue or self.queue_timeout <= 0:
+            self.stats["shed"] += 1
+            return False
+
+        self.stats["queued"] += 1
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            # A slot is taken on our behalf when the future is resolved
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self.stats["shed"] += 1
+            return False
+        except asyncio.CancelledError:
+            self._discard(waiter)
+            if waiter.done() and not waiter.cancelled():
+                self._release_slot()
+            raise
+        self.stats["admitted"] += 1
+        return True
+
+    def _discard(self, waiter):
+        try:
+            self.waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _wake_waiters(self):
+        # Admit as many queued requests as the current limit allows, so an
+        # increased limit takes effect while the queue is still standing
+        while self.waiters and self._has_capacity():
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _release_slot(self):
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    def release(self, latency: float, failed: bool = False):
+        """Return a slot and adapt the limit to the request outcome"""
+        now = time.monotonic()
+        if failed or latency > self.latency_target:
+            # At most one decrease per latency window, so a burst of slow
+            # responses to the same overload only counts once
+            if now - self.last_decrease > self.latency_target:
+                self.limit = max(self.min_limit, self.limit * self.decrease_ratio)
+                self.last_decrease = now
+                logger.warning(f"Admission limit for {self.name} decreased to {int(self.limit)}")
+        elif self.in_flight >= int(self.limit) or self.waiters:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._release_slot()
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": len(self.waiters),
+            **self.stats
+        }
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the database while the circuit is open"""
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"Circuit {name} is open")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for calls to a struggling dependency
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls fail fast for `reset_timeout` seconds; then a single probe call is
+    let through (half-open) and its outcome closes or re-opens the circuit.
+    Call deadlines are left to the client library (e.g. the MongoDB driver's
+    timeoutMS), which stops the operation itself instead of abandoning it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float,
+                 failure_exceptions: Tuple[Type[BaseException], ...]):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_exceptions = failure_exceptions
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == "open" and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def retry_after(self) -> int:
+        remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+        return max(1, math.ceil(remaining))
+
+    def _before_call(self):
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError(self.name, self.retry_after())
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self.probe_in_flight:
+                raise CircuitOpenError(self.name, settings.admission_retry_after_seconds)
+            self.probe_in_flight = True
+
+    def record_success(self):
+        if self.state != "closed":
+            logger.info(f"Circuit {self.name} closed")
+        self.state = "closed"
+        self.failures = 0
+        self.probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.probe_in_flight = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.error(f"Circuit {self.name} opened after {self.failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def __call__(self, fn):
+        """Decorator protecting an async function with this breaker"""
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            self._before_call()
+            try:
+                result = await fn(*args, **kwargs)
+            except self.failure_exceptions:
+                self.record_failure()
+                raise
+            except BaseException:
+                # Not a dependency failure (e.g. bad input); don't count it
+                if self.state == "half_open":
+                    self.probe_in_flight = False
+                raise
+            self.record_success()
+            return result
+        return wrapper
+
+    def snapshot(self) -> dict:
+        return {"state": "open" if self.is_open else self.state, "consecutive_failures": self.failures}
+
+
+def build_limiters() -> Dict[str, AdaptiveLimiter]:
+    """Create the per route class limiters from settings"""
+    return {
+        route_class: AdaptiveLimiter(
+            route_class,
+            initial_limit=getattr(settings, f"admission_{route_class}_initial_limit"),
+            min_limit=getattr(settings, f"admission_{route_class}_min_limit"),
+            max_limit=getattr(settings, f"admission_{route_class}_max_limit"),
+            latency_target=getattr(settings, f"admission_{route_class}_latency_target_seconds"),
+            queue_timeout=getattr(settings, f"admission_{route_class}_queue_timeout_seconds"),
+            max_queue=getattr(settings, f"admission_{route_class}_max_queue"),
+        )
+        for route_class in ("db", "static")
+    }
+
+
+async def send_overloaded(send, retry_after: int):
+    """Send a fast 503 response telling the client when to retry"""
+    body = json.dumps({
+        "error": "Service temporarily overloaded",
+        "message": "The server is busy. Please try again shortly."
+    }).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"retry-after", str(retry_after).encode("latin-1")),
+        ]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware applying a concurrency limit per route class
+    `classify` maps a request path to a route class ("db", "static") or
+    None for requests that are never limited (health checks, docs).
+    """
+
+    def __init__(self, app, classify: Callable[[str], Optional[str]],
+                 limiters: Dict[str, AdaptiveLimiter], breaker: Optional[CircuitBreaker] = None):
+        self.app = app
+        self.classify = classify
+        self.limiters = limiters
+        self.breaker = breaker
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.admission_enabled:
+            return await self.app(scope, receive, send)
+
+        route_class = self.classify(scope["path"])
+        limiter = self.limiters.get(route_class)
+        if limiter is None:
+            return await self.app(scope, receive, send)
+
+        # Don't queue requests for a database we already know is down
+        if route_class == "db" and self.breaker is not None and self.breaker.is_open:
+            limiter.stats["shed"] += 1
+            return await send_overloaded(send, self.breaker.retry_after())
+
+        if not await limiter.acquire():
+            return await send_overloaded(send, settings.admission_retry_after_seconds)
+
+        status_code = 500
+        start = time.monotonic()
+        response_start = None
+
+        async def send_with_status(message):
+            nonlocal status_code, response_start
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_start = time.monotonic()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Measure time to first byte, so slow clients downloading the
+            # body don't look like server overload
+            latency = (response_start or time.monotonic()) - start
+            limiter.release(latency, failed=status_code >= 500)
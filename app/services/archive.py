@@ -0,0 +1,257 @@
+# Contact archival / retention
+import asyncio
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from bson import json_util
+from pymongo import DeleteOne, ReplaceOne
+from pymongo.errors import CollectionInvalid
+
+from app.config import settings
+from app.services.db import db_breaker, mongodb
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FILE_PREFIX = "contacts-"
+ARCHIVE_FILE_SUFFIX = ".ndjson.gz"
+ARCHIVE_INDEX_NAME = "index.json"  # Record count per archive file
+
+
+class ArchiverState:
+    task: Optional[asyncio.Task] = None
+    last_run_at: Optional[datetime] = None
+    last_run_archived: int = 0
+    total_archived: int = 0
+
+
+archiver_state = ArchiverState()
+
+
+def get_archive_dir() -> Path:
+    """Get the directory used by the file archive backend"""
+    return Path(settings.archive_dir)
+
+
+async def ensure_archive_collection():
+    """Create the compressed archive collection if it does not exist yet"""
+    try:
+        await mongodb.database.create_collection(
+            settings.archive_collection_name,
+            storageEngine={"wiredTiger": {"configString": "block_compressor=zstd"}}
+        )
+        logger.info(f"Created compressed archive collection: {settings.archive_collection_name}")
+    except CollectionInvalid:
+        # Collection already exists
+        pass
+    except Exception as e:
+        logger.error(f"Error creating archive collection: {e}")
+
+    try:
+        await mongodb.database[settings.archive_collection_name].create_index("created_at")
+    except Exception as e:
+        logger.error(f"Error creating archive indexes: {e}")
+
+
+async def fetch_expired_batch(cutoff: datetime, batch_size: int) -> list:
+    """Get the oldest batch of contacts created before the cutoff"""
+    contacts_collection = mongodb.database.contacts
+    cursor = (
+        contacts_collection.find({"created_at": {"$lt": cutoff}})
+        .sort("created_at", 1)
+        .limit(batch_size)
+    )
+    return await cursor.to_list(length=batch_size)
+
+
+async def write_batch_to_collection(contacts: list):
+    """Copy a batch into the archive collection (idempotent on _id)"""
+    archive_collection = mongodb.database[settings.archive_collection_name]
+    requests = [ReplaceOne({"_id": c["_id"]}, c, upsert=True) for c in contacts]
+    await archive_collection.bulk_write(requests, ordered=False)
+
+
+def _batch_file_name(contacts: list) -> str:
+    first = contacts[0]
+    created_at = first["created_at"].strftime("%Y%m%dT%H%M%S%f")
+    return f"{ARCHIVE_FILE_PREFIX}{created_at}-{first['_id']}{ARCHIVE_FILE_SUFFIX}"
+
+
+def _write_ndjson_gz(path: Path, contacts: list):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        for contact in contacts:
+            f.write(json_util.dumps(contact, json_options=json_util.RELAXED_JSON_OPTIONS))
+            f.write("\n")
+    # Only expose the file once it is complete
+    os.replace(tmp_path, path)
+
+
+def _load_index(archive_dir: Path) -> dict:
+    try:
+        with open(archive_dir / ARCHIVE_INDEX_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(archive_dir: Path, index: dict):
+    tmp_path = archive_dir / (ARCHIVE_INDEX_NAME + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, archive_dir / ARCHIVE_INDEX_NAME)
+
+
+def _write_batch_file(contacts: list):
+    archive_dir = get_archive_dir()
+    path = archive_dir / _batch_file_name(contacts)
+    _write_ndjson_gz(path, contacts)
+    index = _load_index(archive_dir)
+    index[path.name] = len(contacts)
+    _save_index(archive_dir, index)
+
+
+async def write_batch_to_file(contacts: list):
+    """Write a batch as a gzip NDJSON file and record its size in the archive index"""
+    await asyncio.to_thread(_write_batch_file, contacts)
+
+
+async def delete_batch(contacts: list):
+    """Delete an archived batch from the hot contacts collection"""
+    contacts_collection = mongodb.database.contacts
+    requests = [DeleteOne({"_id": c["_id"]}) for c in contacts]
+    await contacts_collection.bulk_write(requests, ordered=False)
+
+
+async def archive_expired_contacts(now: Optional[datetime] = None) -> int:
+    """
+    Move contacts older than the retention age into the archive
+    Batches are written to the archive before being deleted, so an
+    interrupted pass never loses data and can simply be re-run.
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=settings.archive_after_days)
+    archived = 0
+
+    while True:
+        contacts = await fetch_expired_batch(cutoff, settings.archive_batch_size)
+        if not contacts:
+            break
+
+        if settings.archive_backend == "file":
+            await write_batch_to_file(contacts)
+        else:
+            await write_batch_to_collection(contacts)
+        await delete_batch(contacts)
+
+        archived += len(contacts)
+        logger.info(f"Archived batch of {len(contacts)} contacts (total this pass: {archived})")
+
+        if len(contacts) < settings.archive_batch_size:
+            break
+        # Throttle so archival never competes with live traffic
+        await asyncio.sleep(settings.archive_batch_pause_seconds)
+
+    return archived
+
+
+def _archive_files() -> List[Path]:
+    archive_dir = get_archive_dir()
+    if not archive_dir.is_dir():
+        return []
+    return sorted(
+        (p for p in archive_dir.iterdir() if p.name.endswith(ARCHIVE_FILE_SUFFIX)),
+        reverse=True
+    )
+
+
+def _read_lines(path: Path) -> List[str]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def _read_archive_files(skip: int, limit: int) -> list:
+    index = _load_index(get_archive_dir())
+    contacts = []
+    for path in _archive_files():
+        count = index.get(path.name)
+        # Skip whole files using the index, without decompressing them
+        if count is not None and skip >= count:
+            skip -= count
+            continue
+        lines = _read_lines(path)
+        # Files hold oldest-first records; return newest first like the hot collection
+        for line in reversed(lines):
+            if skip > 0:
+                skip -= 1
+                continue
+            contacts.append(json_util.loads(line))
+            if len(contacts) >= limit:
+                return contacts
+    return contacts
+
+
+async def get_archived_contacts(skip: int = 0, limit: int = 50) -> list:
+    """Get archived contacts with pagination, newest first"""
+    try:
+        if settings.archive_backend == "file":
+            return await asyncio.to_thread(_read_archive_files, skip, limit)
+
+        archive_collection = mongodb.database[settings.archive_collection_name]
+        cursor = archive_collection.find().sort("created_at", -1).skip(skip).limit(limit)
+        return await cursor.to_list(length=limit)
+    except Exception as e:
+        logger.error(f"Error getting archived contacts: {e}")
+        raise e
+
+
+async def run_archiver():
+    """Background loop running an archival pass every interval"""
+    if settings.archive_backend != "file":
+        await ensure_archive_collection()
+
+    while True:
+        try:
+            if db_breaker.is_open:
+                # Leave the database alone while it is struggling
+                logger.info("Skipping contact archival pass, database circuit is open")
+            else:
+                archived = await archive_expired_contacts()
+                archiver_state.last_run_at = datetime.utcnow()
+                archiver_state.last_run_archived = archived
+                archiver_state.total_archived += archived
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error during contact archival: {e}")
+        await asyncio.sleep(settings.archive_interval_seconds)
+
+
+def start_archiver():
+    """Start the background archiver if enabled"""
+    if not settings.archive_enabled or archiver_state.task is not None:
+        return
+    archiver_state.task = asyncio.create_task(run_archiver())
+    logger.info(
+        f"Contact archiver started (backend={settings.archive_backend}, "
+        f"after_days={settings.archive_after_days})"
+    )
+
+
+async def stop_archiver():
+    """Stop the background archiver"""
+    task = archiver_state.task
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    archiver_state.task = None
+    logger.info("Contact archiver stopped")
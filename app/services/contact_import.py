@@ -0,0 +1,333 @@
+# Bulk contact import from streamed NDJSON/CSV uploads
+import asyncio
+import codecs
+import csv
+import json
+import logging
+import time
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from pymongo.errors import PyMongoError
+
+from app.config import settings
+from app.models import ContactDocument, ContactFormRequest
+from app.services.db import db_breaker, insert_contacts
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+# (record number, parsed record or None, parse error or None)
+ParsedRecord = Tuple[int, Optional[dict], Optional[str]]
+
+
+class ImportState:
+    running: bool = False  # Only one import at a time, to bound its share of the pool
+
+
+import_state = ImportState()
+
+
+def _utf8_len(text: str) -> int:
+    # isascii() is O(1) on CPython, so plain ASCII lines are never re-encoded
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def _too_large_error() -> str:
+    return f"Record exceeds {settings.import_max_record_bytes} bytes"
+
+
+class ImportReport:
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.received = 0
+        self.inserted = 0
+        self.invalid = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        self.aborted: Optional[str] = None  # Why the upload stopped early, if it did
+        self.started = time.perf_counter()
+
+    def add_error(self, record: int, messages: List[str]):
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"record": record, "errors": messages})
+
+    def to_dict(self) -> dict:
+        duration = time.perf_counter() - self.started
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "invalid": self.invalid,
+            "failed": self.failed,
+            "duration_seconds": round(duration, 3),
+            "records_per_second": round(self.received / duration, 1) if duration > 0 else None,
+            "errors": sorted(self.errors, key=lambda e: e["record"]),
+            "errors_truncated": self.invalid + self.failed > len(self.errors),
+            "aborted": self.aborted,
+        }
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Optional[str]]:
+    """
+    Split a byte stream into text lines without buffering the whole body
+    A line longer than the record limit (in UTF-8 bytes) is yielded as None,
+    however the upload was chunked; once a partial line is over the limit
+    its remaining bytes are discarded up to the next newline.
+    """
+    max_bytes = settings.import_max_record_bytes
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    skipping = False
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        if skipping:
+            _, newline, buffer = buffer.partition("\n")
+            if not newline:
+                buffer = ""
+                continue
+            skipping = False
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            line = line.rstrip("\r")
+            yield None if _utf8_len(line) > max_bytes else line
+        if _utf8_len(buffer) > max_bytes:
+            yield None
+            buffer = ""
+            skipping = True
+    buffer += decoder.decode(b"", final=True)
+    if buffer and not skipping:
+        buffer = buffer.rstrip("\r")
+        yield None if _utf8_len(buffer) > max_bytes else buffer
+
+
+async def iter_ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRecord]:
+    """One JSON object per line; records are numbered by line"""
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if line is None:
+            yield line_no, None, _too_large_error()
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line), None
+        except ValueError as e:
+            yield line_no, None, f"Invalid JSON: {e}"
+
+
+def _ends_in_quoted_field(line: str, in_quotes: bool) -> bool:
+    """
+    Track CSV quoting across one line
+    A quote only opens a quoted field at the start of a field, and `""`
+    is an escaped quote inside one, so stray quotes such as `27" screen`
+    in an unquoted field are plain text.
+    """
+    if not in_quotes and '"' not in line:
+        return False
+    field_start = not in_quotes
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if in_quotes:
+            if char == '"':
+                if line[i + 1:i + 2] == '"':
+                    i += 1
+                else:
+                    in_quotes = False
+        elif char == '"' and field_start:
+            in_quotes = True
+            field_start = False
+        else:
+            field_start = char == ","
+        i += 1
+    return in_quotes
+
+
+async def iter_csv_records(lines: AsyncIterator[Optional[str]]) -> AsyncIterator[ParsedRecord]:
+    """
+    CSV with a header row; records are numbered by their first line
+    Oversized or unterminated records are reported and parsing resumes at
+    the next line.
+    """
+    header = None
+    pending: List[str] = []
+    pending_size = 0
+    start_line = line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not pending:
+            start_line = line_no
+        if line is None:
+            pending, pending_size = [], 0
+            yield start_line, None, _too_large_error()
+            continue
+        in_quotes = _ends_in_quoted_field(line, bool(pending))
+        pending.append(line)
+        # Lines are under the limit already; this bounds multi-line records
+        pending_size += _utf8_len(line) + (1 if len(pending) > 1 else 0)
+        if pending_size > settings.import_max_record_bytes:
+            pending, pending_size = [], 0
+            hint = " (unterminated quoted field?)" if in_quotes else ""
+            yield start_line, None, f"{_too_large_error()}{hint}"
+            continue
+        if in_quotes:
+            # Quoted field continues on the next line
+            continue
+        text = "\n".join(pending)
+        pending, pending_size = [], 0
+        if not text.strip():
+            continue
+        try:
+            row = next(csv.reader([text]))
+        except csv.Error as e:
+            yield start_line, None, f"Invalid CSV: {e}"
+            continue
+        if header is None:
+            header = [column.strip().lower() for column in row]
+            continue
+        if len(row) != len(header):
+            yield start_line, None, f"Expected {len(header)} columns, got {len(row)}"
+            continue
+        yield start_line, dict(zip(header, row)), None
+    if pending:
+        yield start_line, None, "Invalid CSV: unterminated quoted field"
+
+
+def validate_batch(batch: List[Tuple[int, dict]], now: datetime):
+    """
+    Apply the contact form rules to a batch of records
+    Returns the documents to insert, their record numbers and per-record errors.
+    """
+    documents, record_numbers, errors = [], [], []
+    for record_no, data in batch:
+        if not isinstance(data, dict):
+            errors.append((record_no, ["Record must be an object"]))
+            continue
+        try:
+            contact_request = ContactFormRequest(**data)
+            contact_doc = ContactDocument(
+                name=contact_request.name,
+                email=contact_request.email,
+                subject=contact_request.subject,
+                message=contact_request.message,
+                # Keep the original submission time of migrated enquiries
+                created_at=data.get("created_at") or now,
+                ip_address=data.get("ip_address") or None,
+                user_agent=data.get("user_agent") or None
+            )
+        except ValidationError as e:
+            errors.append((record_no, [
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+            ]))
+            continue
+        except TypeError as e:
+            errors.append((record_no, [str(e)]))
+            continue
+        documents.append(contact_doc.dict())
+        record_numbers.append(record_no)
+    return documents, record_numbers, errors
+
+
+async def _import_batch(batch: List[Tuple[int, dict]], report: ImportReport, now: datetime):
+    # Validation is CPU-bound; keep it off the event loop
+    documents, record_numbers, errors = await asyncio.to_thread(validate_batch, batch, now)
+    report.invalid += len(errors)
+    for record_no, messages in errors:
+        report.add_error(record_no, messages)
+    if not documents:
+        return
+
+    if db_breaker.is_open:
+        # Leave the database to live traffic while it is struggling
+        report.failed += len(documents)
+        for record_no in record_numbers:
+            report.add_error(record_no, ["Database unavailable, record not imported"])
+        return
+
+    try:
+        inserted, write_errors = await insert_contacts(documents)
+    except Exception as e:
+        if isinstance(e, PyMongoError) and e.timeout:
+            message = f"Insert timed out, record may have been stored: {e}"
+        else:
+            message = f"Insert failed: {e}"
+        report.failed += len(documents)
+        for record_no in record_numbers:
+            report.add_error(record_no, [message])
+        return
+
+    report.inserted += inserted
+    report.failed += len(write_errors)
+    for index, message in write_errors:
+        report.add_error(record_numbers[index], [message])
+
+
+async def import_contacts(chunks: AsyncIterator[bytes], file_format: str,
+                          batch_size: int, concurrency: int) -> dict:
+    """
+    Import contacts from a streamed upload
+    Records are parsed as they arrive and inserted in batches, with at
+    most `concurrency` batches in flight; parsing waits for a free slot,
+    so memory stays bounded regardless of upload size.
+    """
+    import_state.running = True
+    try:
+        return await _import_contacts(chunks, file_format, batch_size, concurrency)
+    finally:
+        import_state.running = False
+
+
+async def _import_contacts(chunks: AsyncIterator[bytes], file_format: str,
+                           batch_size: int, concurrency: int) -> dict:
+    report = ImportReport(settings.import_max_errors)
+    now = datetime.utcnow()
+    lines = iter_lines(chunks)
+    records = iter_csv_records(lines) if file_format == "csv" else iter_ndjson_records(lines)
+
+    slots = asyncio.Semaphore(concurrency)
+    tasks = set()
+
+    async def run_batch(batch):
+        try:
+            await _import_batch(batch, report, now)
+        finally:
+            slots.release()
+
+    async def submit(batch):
+        await slots.acquire()
+        task = asyncio.create_task(run_batch(batch))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    batch: List[Tuple[int, dict]] = []
+    try:
+        try:
+            async for record_no, data, error in records:
+                report.received += 1
+                if error is not None:
+                    report.invalid += 1
+                    report.add_error(record_no, [error])
+                    continue
+                batch.append((record_no, data))
+                if len(batch) >= batch_size:
+                    await submit(batch)
+                    batch = []
+        except Exception as e:
+            # Client disconnects or undecodable bytes; still import the
+            # records parsed so far and report them
+            report.aborted = str(e) or type(e).__name__
+            logger.error(f"Contact import aborted after {report.received} records: {report.aborted}")
+        if batch:
+            await submit(batch)
+    finally:
+        await asyncio.gather(*tasks)
+
+    result = report.to_dict()
+    logger.info(
+        f"Contact import finished: {result['inserted']} inserted, {result['invalid']} invalid, "
+        f"{result['failed']} failed in {result['duration_seconds']}s ({result['records_per_second']} records/s)"
+    )
+    return result
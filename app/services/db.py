@@ -1,8 +1,12 @@
 # MongoDB operations
+import pymongo
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo.errors import ConnectionFailure
+from pymongo.errors import AutoReconnect, BulkWriteError, ConnectionFailure, ExecutionTimeout, WTimeoutError
+from typing import List, Tuple
 import logging
 from app.config import settings
+from app.services.tracing import get_mongo_event_listeners, traced
+from app.services.admission import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +18,16 @@ class MongoDB:
 
 mongodb = MongoDB()
 
+# Fails database calls fast while MongoDB is unreachable or timing out.
+# Driver timeouts surface as NetworkTimeout / ServerSelectionTimeoutError
+# (both AutoReconnect) or ExecutionTimeout.
+db_breaker = CircuitBreaker(
+    "mongodb",
+    failure_threshold=settings.db_breaker_failure_threshold,
+    reset_timeout=settings.db_breaker_reset_timeout_seconds,
+    failure_exceptions=(AutoReconnect, ConnectionFailure, ExecutionTimeout, WTimeoutError)
+)
+
 
 async def connect_to_mongo():
     """Create database connection"""
@@ -28,16 +42,22 @@ async def connect_to_mongo():
             maxPoolSize=10,
             minPoolSize=1,
             retryWrites=True,
-            retryReads=True
+            retryReads=True,
+            # Per-operation deadline enforced by the driver (maxTimeMS on the
+            # server plus client-side socket and pool timeouts)
+            timeoutMS=int(settings.db_call_timeout_seconds * 1000),
+            event_listeners=get_mongo_event_listeners()
         )
         mongodb.database = mongodb.client[settings.database_name]
         
-        # Test the connection
-        await mongodb.client.admin.command('ping')
-        logger.info("Successfully connected to MongoDB")
-        
-        # Create indexes for better performance
-        await create_indexes()
+        # Startup may wait for a cold cluster, so allow the longer connect budget
+        with pymongo.timeout(30):
+            # Test the connection
+            await mongodb.client.admin.command('ping')
+            logger.info("Successfully connected to MongoDB")
+            
+            # Create indexes for better performance
+            await create_indexes()
         
     except ConnectionFailure as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
@@ -73,8 +93,15 @@ def get_database() -> AsyncIOMotorDatabase: # type: ignore
 
 
 # Database service functions
+@traced("db.insert_contact")
+@db_breaker
 async def insert_contact(contact_data: dict) -> str:
-    """Insert a new contact form submission"""
+    """
+    Insert a new contact form submission
+    If the call times out the insert may still have been applied by the
+    server, so callers must not blindly resubmit. The driver assigns `_id`
+    client side and retryable writes make its own retry idempotent.
+    """
     try:
         contacts_collection = mongodb.database.contacts
         result = await contacts_collection.insert_one(contact_data)
@@ -85,6 +112,31 @@ async def insert_contact(contact_data: dict) -> str:
         raise e
 
 
+@traced("db.insert_contacts")
+async def insert_contacts(contacts: list) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    Insert a batch of contacts, continuing past documents that fail
+    Returns the number inserted and (batch index, error message) per failure.
+    Bulk imports are not behind db_breaker, so a slow import batch can't
+    open the circuit for live traffic, and get their own longer deadline.
+    """
+    try:
+        contacts_collection = mongodb.database.contacts
+        with pymongo.timeout(settings.import_batch_timeout_seconds):
+            result = await contacts_collection.insert_many(contacts, ordered=False)
+        return len(result.inserted_ids), []
+    except BulkWriteError as e:
+        details = e.details
+        write_errors = [(err["index"], err.get("errmsg", "Write error")) for err in details.get("writeErrors", [])]
+        logger.error(f"Bulk insert completed with {len(write_errors)} write errors")
+        return details.get("nInserted", 0), write_errors
+    except Exception as e:
+        logger.error(f"Error inserting contacts: {e}")
+        raise e
+
+
+@traced("db.get_contact_by_id")
+@db_breaker
 async def get_contact_by_id(contact_id: str) -> dict:
     """Get a contact by ID"""
     try:
@@ -97,6 +149,8 @@ async def get_contact_by_id(contact_id: str) -> dict:
         raise e
 
 
+@traced("db.get_all_contacts")
+@db_breaker
 async def get_all_contacts(skip: int = 0, limit: int = 50) -> list:
     """Get all contacts with pagination"""
     try:
@@ -0,0 +1,300 @@
+# Runtime memory, GC, event loop and CPU diagnostics
+import asyncio
+import gc
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Literal, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_SNAPSHOTS = 5
+MAX_TRACEMALLOC_FRAMES = 65535  # tracemalloc's own upper bound
+MAX_OBJECT_TYPES = 100
+
+# Valid `key_type` values for Snapshot.statistics / compare_to
+GroupBy = Literal["lineno", "filename", "traceback"]
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+)
+
+
+# tracemalloc
+
+class TracemallocState:
+    snapshots: "OrderedDict[int, tracemalloc.Snapshot]" = OrderedDict()
+    next_id: int = 1
+    # Snapshots are taken on worker threads (see the diagnostics routes)
+    lock = threading.Lock()
+
+
+tracemalloc_state = TracemallocState()
+
+
+def start_tracemalloc(frames: int = 10):
+    """Start tracing allocations (adds noticeable overhead while running)"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+        logger.info(f"tracemalloc started with {frames} frames")
+
+
+def stop_tracemalloc():
+    """Stop tracing allocations and drop stored snapshots"""
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+        logger.info("tracemalloc stopped")
+    with tracemalloc_state.lock:
+        tracemalloc_state.snapshots.clear()
+
+
+def _require_tracing():
+    if not tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc is not running")
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+
+def take_snapshot() -> int:
+    """Store a snapshot for later diffs; only the newest few are kept"""
+    _require_tracing()
+    snapshot = _take_snapshot()
+    with tracemalloc_state.lock:
+        snapshot_id = tracemalloc_state.next_id
+        tracemalloc_state.next_id += 1
+        tracemalloc_state.snapshots[snapshot_id] = snapshot
+        while len(tracemalloc_state.snapshots) > MAX_SNAPSHOTS:
+            tracemalloc_state.snapshots.popitem(last=False)
+    return snapshot_id
+
+
+def _format_stat(stat) -> dict:
+    return {
+        "site": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+        "size_kb": round(stat.size / 1024, 1),
+        "count": stat.count,
+    }
+
+
+def top_allocations(limit: int = 20, group_by: GroupBy = "lineno") -> List[dict]:
+    """Largest live allocation sites"""
+    _require_tracing()
+    stats = _take_snapshot().statistics(group_by)
+    return [_format_stat(stat) for stat in stats[:limit]]
+
+
+def diff_snapshots(base_id: int, target_id: Optional[int] = None, limit: int = 20,
+                   group_by: GroupBy = "lineno") -> List[dict]:
+    """Allocation growth between a stored snapshot and another (or now)"""
+    _require_tracing()
+    with tracemalloc_state.lock:
+        snapshots = dict(tracemalloc_state.snapshots)
+    if base_id not in snapshots or (target_id is not None and target_id not in snapshots):
+        raise KeyError("Unknown snapshot id")
+    target = snapshots[target_id] if target_id is not None else _take_snapshot()
+    stats = target.compare_to(snapshots[base_id], group_by)
+    return [
+        {**_format_stat(stat), "size_diff_kb": round(stat.size_diff / 1024, 1), "count_diff": stat.count_diff}
+        for stat in stats[:limit]
+    ]
+
+
+def tracemalloc_status() -> dict:
+    status = {"tracing": tracemalloc.is_tracing(), "snapshots": list(tracemalloc_state.snapshots)}
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        status.update({
+            "frames": tracemalloc.get_traceback_limit(),
+            "traced_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+        })
+    return status
+
+
+# Garbage collector
+
+def gc_stats(object_types: int = 0) -> dict:
+    """Collector counters; optionally the most common live object types (slow)"""
+    stats = {
+        "enabled": gc.isenabled(),
+        "counts": gc.get_count(),
+        "thresholds": gc.get_threshold(),
+        "generations": gc.get_stats(),
+        "garbage": len(gc.garbage),
+    }
+    if object_types:
+        counts = Counter(type(obj).__name__ for obj in gc.get_objects())
+        stats["object_types"] = counts.most_common(min(object_types, MAX_OBJECT_TYPES))
+    return stats
+
+
+def gc_collect() -> dict:
+    """Run a full collection and report what was freed"""
+    start = time.perf_counter()
+    collected = gc.collect()
+    return {"collected": collected, "duration_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+
+# Event loop lag
+
+class _SlowCallbackHandler(logging.Handler):
+    def __init__(self, records: deque):
+        super().__init__(logging.WARNING)
+        self.records = records
+
+    def emit(self, record):
+        message = record.getMessage()
+        if message.startswith("Executing "):
+            self.records.append({"at": datetime.utcnow().isoformat(), "message": message})
+
+
+class LoopMonitor:
+    """
+    Measures event loop lag by timing how late a periodic sleep wakes up
+    Slow-callback detection uses asyncio debug mode, which adds overhead
+    of its own, so it is enabled separately.
+    """
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.interval = 0.1
+        self.lags: deque = deque(maxlen=600)
+        self.max_lag = 0.0
+        self.slow_callbacks: deque = deque(maxlen=100)
+        self._handler: Optional[_SlowCallbackHandler] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._saved_debug: Optional[tuple] = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def start(self, interval: float = 0.1, slow_callback_ms: Optional[float] = None):
+        """Start monitoring on the running loop"""
+        # A zero interval would wake the monitor on every loop iteration
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if slow_callback_ms is not None and slow_callback_ms <= 0:
+            raise ValueError("slow_callback_ms must be positive")
+        self.stop()
+        self.interval = interval
+        self.lags.clear()
+        self.max_lag = 0.0
+        self._loop = asyncio.get_running_loop()
+        self.task = asyncio.create_task(self._run())
+
+        if slow_callback_ms:
+            self._saved_debug = (self._loop.get_debug(), self._loop.slow_callback_duration)
+            self._loop.slow_callback_duration = slow_callback_ms / 1000
+            self._loop.set_debug(True)
+            self._handler = _SlowCallbackHandler(self.slow_callbacks)
+            logging.getLogger("asyncio").addHandler(self._handler)
+        logger.info(f"Event loop monitor started (interval={interval}s, slow_callback_ms={slow_callback_ms})")
+
+    def stop(self):
+        """Stop monitoring and restore the loop's debug settings"""
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        if self._handler is not None:
+            logging.getLogger("asyncio").removeHandler(self._handler)
+            self._handler = None
+        if self._saved_debug is not None and self._loop is not None:
+            debug, slow_callback_duration = self._saved_debug
+            self._loop.set_debug(debug)
+            self._loop.slow_callback_duration = slow_callback_duration
+            self._saved_debug = None
+
+    def stats(self) -> dict:
+        lags = sorted(self.lags)
+        stats = {"running": self.running, "interval": self.interval, "samples": len(lags),
+                 "slow_callbacks": list(self.slow_callbacks)}
+        if lags:
+            stats.update({
+                "avg_lag_ms": round(sum(lags) / len(lags) * 1000, 2),
+                "p99_lag_ms": round(lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000, 2),
+                "max_lag_ms": round(self.max_lag * 1000, 2),
+            })
+        return stats
+
+
+loop_monitor = LoopMonitor()
+
+
+# Sampling CPU profiler
+
+_profile_lock = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def sample_stacks(thread_id: int, seconds: float, interval: float) -> Counter:
+    """Sample a thread's stack every `interval` seconds; returns collapsed stacks"""
+    stacks: Counter = Counter()
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        frame = sys._current_frames().get(thread_id)
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        if labels:
+            stacks[";".join(reversed(labels))] += 1
+        time.sleep(interval)
+    return stacks
+
+
+def run_cpu_profile(thread_id: int, seconds: float, interval: float, top: int = 20) -> dict:
+    """
+    Profile a thread and write a collapsed-stack (flame graph) file
+    Runs on a worker thread so the profiled event loop keeps serving.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise RuntimeError("A CPU profile is already running")
+    try:
+        stacks = sample_stacks(thread_id, seconds, interval)
+    finally:
+        _profile_lock.release()
+
+    profile_dir = Path(settings.diagnostics_dir)
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    path = profile_dir / f"profile-{datetime.utcnow():%Y%m%dT%H%M%S}.folded"
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+    leaves: Dict[str, int] = Counter()
+    for stack, count in stacks.items():
+        leaves[stack.rsplit(";", 1)[-1]] += count
+    total = sum(stacks.values())
+    return {
+        "path": str(path),
+        "samples": total,
+        "top": [
+            {"function": name, "samples": count, "percent": round(count * 100 / total, 1)}
+            for name, count in leaves.most_common(top)
+        ],
+    }
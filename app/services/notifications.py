@@ -0,0 +1,304 @@
+# Background notification fan-out for contact submissions
+import asyncio
+import json
+import logging
+import random
+import smtplib
+import urllib.parse
+import urllib.request
+from abc import ABC, abstractmethod
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.services.db import mongodb
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationSink(ABC):
+    """
+    Base class for notification sinks
+    Subclasses set a unique `name` and implement `send`, raising on failure
+    to trigger a retry.
+    """
+    name: str
+    max_concurrency: Optional[int] = None  # Defaults to settings.notification_sink_concurrency
+
+    @abstractmethod
+    async def send(self, payload: dict):
+        """Deliver one notification payload"""
+
+
+class WebhookSink(NotificationSink):
+    """
+    POST the payload as JSON to a webhook URL
+    Webhook URLs usually embed a secret token, so the sink is named by its
+    position and host only; the URL never reaches logs or dead letters.
+    """
+
+    def __init__(self, url: str, index: int = 0, timeout: Optional[float] = None):
+        self.url = url
+        self.name = f"webhook:{index}:{urllib.parse.urlsplit(url).hostname}"
+        self.timeout = timeout or settings.notification_webhook_timeout_seconds
+
+    def _post(self, payload: dict):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if response.status >= 300:
+                raise RuntimeError(f"Webhook returned status {response.status}")
+
+    async def send(self, payload: dict):
+        await asyncio.to_thread(self._post, payload)
+
+
+class EmailSink(NotificationSink):
+    """Send the payload as a plain-text email over SMTP"""
+
+    def __init__(self, host: str, port: int, sender: str, recipient: str):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipient = recipient
+        self.name = f"smtp:{host}:{port}"
+
+    def _send_mail(self, payload: dict):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = self.recipient
+        message["Reply-To"] = payload["email"]
+        message["Subject"] = f"New contact: {payload['subject']}"
+        message.set_content(
+            f"From: {payload['name']} <{payload['email']}>\n"
+            f"Received: {payload['created_at']}\n\n"
+            f"{payload['message']}"
+        )
+        with smtplib.SMTP(self.host, self.port, timeout=settings.notification_webhook_timeout_seconds) as smtp:
+            smtp.send_message(message)
+
+    async def send(self, payload: dict):
+        await asyncio.to_thread(self._send_mail, payload)
+
+
+class NotificationJob:
+    def __init__(self, sink: NotificationSink, payload: dict):
+        self.sink = sink
+        self.payload = payload
+        self.attempts = 0
+        self.last_error: Optional[str] = None
+
+
+class NotificationQueue:
+    """
+    In-process task queue with retries and dead-lettering
+    Each sink gets its own bounded queue and workers, so a slow sink never
+    holds up deliveries to the others.
+    """
+
+    def __init__(self):
+        self.sinks: List[NotificationSink] = []
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.workers: List[asyncio.Task] = []
+        self.retry_tasks: Dict[asyncio.Task, NotificationJob] = {}
+        self.in_flight: set = set()
+        self.dead_letter_tasks: set = set()
+        self.stats = {"delivered": 0, "retried": 0, "dead_lettered": 0, "dropped": 0}
+
+    @property
+    def running(self) -> bool:
+        return bool(self.workers)
+
+    def has_sink(self, name: str) -> bool:
+        return any(s.name == name for s in self.sinks)
+
+    def register_sink(self, sink: NotificationSink):
+        """Register a sink to receive every contact notification"""
+        if not getattr(sink, "name", None):
+            raise ValueError(f"Notification sink {type(sink).__name__} has no name")
+        if sink in self.sinks:
+            return
+        if self.has_sink(sink.name):
+            raise ValueError(f"A notification sink named {sink.name} is already registered")
+        self.sinks.append(sink)
+        if self.running:
+            self._start_sink(sink)
+
+    def _start_sink(self, sink: NotificationSink):
+        queue = asyncio.Queue(maxsize=settings.notification_queue_size)
+        self.queues[sink.name] = queue
+        concurrency = sink.max_concurrency or settings.notification_sink_concurrency
+        self.workers.extend(
+            asyncio.create_task(self._worker(queue)) for _ in range(concurrency)
+        )
+
+    def start(self):
+        """Start a queue and workers for every sink"""
+        if self.running:
+            return
+        for sink in self.sinks:
+            self._start_sink(sink)
+        logger.info(
+            f"Notification workers started ({len(self.workers)} workers, {len(self.sinks)} sinks)"
+        )
+
+    async def stop(self, timeout: float = 5.0):
+        """
+        Drain pending notifications (up to timeout) and stop the workers
+        Jobs still queued, in flight or waiting to retry are dead-lettered.
+        """
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self.queues.values())),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            pending = sum(queue.qsize() for queue in self.queues.values())
+            logger.warning(f"Notification queues not drained, {pending} jobs dead-lettered")
+
+        unfinished = list(self.in_flight)
+        unfinished.extend(job for task, job in self.retry_tasks.items() if not task.done())
+        for task in [*self.workers, *self.retry_tasks]:
+            task.cancel()
+        await asyncio.gather(*self.workers, *self.retry_tasks, return_exceptions=True)
+        for queue in self.queues.values():
+            while not queue.empty():
+                unfinished.append(queue.get_nowait())
+        await asyncio.gather(
+            *(self._dead_letter(job, reason="shutdown") for job in unfinished),
+            *self.dead_letter_tasks
+        )
+        self.queues = {}
+        self.workers = []
+        self.retry_tasks = {}
+        self.in_flight = set()
+        logger.info("Notification workers stopped")
+
+    def enqueue(self, payload: dict):
+        """Fan a payload out to every sink without waiting for delivery"""
+        if not self.running:
+            return
+        for sink in self.sinks:
+            self._put(NotificationJob(sink, payload))
+
+    def _put(self, job: NotificationJob):
+        try:
+            self.queues[job.sink.name].put_nowait(job)
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            logger.warning(f"Notification queue for {job.sink.name} full, dead-lettering job")
+            task = asyncio.create_task(self._dead_letter(job, reason="queue_full"))
+            self.dead_letter_tasks.add(task)
+            task.add_done_callback(self.dead_letter_tasks.discard)
+
+    def _backoff(self, attempts: int) -> float:
+        delay = settings.notification_backoff_base_seconds * (2 ** (attempts - 1))
+        delay = min(delay, settings.notification_backoff_max_seconds)
+        # Full jitter so retries from a burst don't line up
+        return random.uniform(delay / 2, delay)
+
+    async def _retry_later(self, job: NotificationJob, delay: float):
+        await asyncio.sleep(delay)
+        self._put(job)
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            job = await queue.get()
+            self.in_flight.add(job)
+            try:
+                await self._deliver(job)
+            finally:
+                self.in_flight.discard(job)
+                queue.task_done()
+
+    async def _deliver(self, job: NotificationJob):
+        job.attempts += 1
+        try:
+            await job.sink.send(job.payload)
+            self.stats["delivered"] += 1
+            return
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.last_error = str(e)
+            logger.warning(f"Notification to {job.sink.name} failed (attempt {job.attempts}): {e}")
+
+        if job.attempts >= settings.notification_max_attempts:
+            self.in_flight.discard(job)
+            await self._dead_letter(job, reason="max_attempts")
+            return
+
+        # Schedule the retry without holding a worker during the backoff
+        self.stats["retried"] += 1
+        task = asyncio.create_task(self._retry_later(job, self._backoff(job.attempts)))
+        self.retry_tasks[task] = job
+        task.add_done_callback(lambda t: self.retry_tasks.pop(t, None))
+
+    async def _dead_letter(self, job: NotificationJob, reason: str):
+        self.stats["dead_lettered"] += 1
+        logger.error(
+            f"Notification to {job.sink.name} dead-lettered ({reason}) after {job.attempts} attempts"
+        )
+        try:
+            collection = mongodb.database[settings.notification_dead_letter_collection]
+            await collection.insert_one({
+                "sink": job.sink.name,
+                "payload": job.payload,
+                "attempts": job.attempts,
+                "last_error": job.last_error,
+                "reason": reason,
+                "failed_at": datetime.utcnow()
+            })
+        except Exception as e:
+            logger.error(f"Error writing notification dead letter: {e}")
+
+
+notification_queue = NotificationQueue()
+
+
+def configure_default_sinks():
+    """Register the sinks configured through settings (safe to call on every startup)"""
+    sinks = [WebhookSink(url, index) for index, url in enumerate(settings.notification_webhook_urls)]
+    if settings.notification_smtp_host and settings.notification_email_to:
+        sinks.append(EmailSink(
+            settings.notification_smtp_host,
+            settings.notification_smtp_port,
+            settings.notification_email_from or settings.notification_email_to,
+            settings.notification_email_to
+        ))
+    for sink in sinks:
+        # Already registered by an earlier startup in this process
+        if not notification_queue.has_sink(sink.name):
+            notification_queue.register_sink(sink)
+
+
+async def start_notification_workers():
+    """Register configured sinks and start workers if any sink exists"""
+    configure_default_sinks()
+    if notification_queue.sinks:
+        notification_queue.start()
+
+
+async def stop_notification_workers():
+    """Stop notification workers"""
+    await notification_queue.stop()
+
+
+def notify_new_contact(contact_id: str, contact_data: dict):
+    """Queue notifications for a newly stored contact"""
+    payload = {
+        "id": contact_id,
+        "name": contact_data["name"],
+        "email": contact_data["email"],
+        "subject": contact_data["subject"],
+        "message": contact_data["message"],
+        "created_at": contact_data["created_at"].isoformat()
+    }
+    notification_queue.enqueue(payload)
@@ -0,0 +1,264 @@
+# Static file serving from a route table built at startup
+import asyncio
+import hashlib
+import logging
+import mimetypes
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+from app.config import settings
+from app.services.tracing import span
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".svg": "image/svg+xml",
+    ".pdf": "application/pdf",
+}
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg"}
+
+CHUNK_SIZE = 64 * 1024
+
+
+class StaticFile(NamedTuple):
+    """Immutable metadata (and content or open fd) for one served file"""
+    path: Path
+    size: int
+    mtime: float
+    media_type: str
+    etag: str
+    last_modified: str
+    content: Optional[bytes]  # Set when the file is small enough to keep in memory
+    fd: Optional[int]  # Open descriptor for larger files, read with os.pread
+
+
+class StaticRoute(NamedTuple):
+    file: StaticFile
+    headers: Tuple[Tuple[bytes, bytes], ...]  # Precomputed response headers
+
+
+def _load_file(path: Path) -> StaticFile:
+    stat = path.stat()
+    media_type = MEDIA_TYPES.get(path.suffix.lower()) or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if stat.st_size <= settings.static_memory_cache_max_bytes:
+        content = path.read_bytes()
+        fd = None
+        etag = hashlib.md5(content).hexdigest()
+    else:
+        content = None
+        fd = os.open(path, os.O_RDONLY)
+        etag = hashlib.md5(f"{stat.st_mtime}-{stat.st_size}".encode()).hexdigest()
+    return StaticFile(
+        path=path,
+        size=stat.st_size,
+        mtime=stat.st_mtime,
+        media_type=media_type,
+        etag=f'"{etag}"',
+        last_modified=formatdate(stat.st_mtime, usegmt=True),
+        content=content,
+        fd=fd,
+    )
+
+
+def _route(file: StaticFile, cache_control: str, disposition: Optional[str] = None) -> StaticRoute:
+    headers = [
+        (b"content-type", file.media_type.encode("latin-1")),
+        (b"etag", file.etag.encode("latin-1")),
+        (b"last-modified", file.last_modified.encode("latin-1")),
+        (b"cache-control", cache_control.encode("latin-1")),
+        (b"accept-ranges", b"bytes"),
+    ]
+    if disposition:
+        headers.append((b"content-disposition", disposition.encode("latin-1")))
+    return StaticRoute(file=file, headers=tuple(headers))
+
+
+def _scan_files(static_dir: Path) -> Dict[str, StaticFile]:
+    root = static_dir.resolve()
+    files = {}
+    for path in sorted(root.rglob("*")):
+        # Only regular files that really live under the static root
+        if path.is_symlink() or not path.is_file():
+            continue
+        if root not in path.resolve().parents:
+            continue
+        files[path.relative_to(root).as_posix()] = _load_file(path)
+    return files
+
+
+class StaticRouteTable:
+    """Frozen mapping from request URL to the file served for it"""
+
+    def __init__(self, static_dir: Path, api_prefix: str):
+        self.static_dir = static_dir
+        self.api_prefix = api_prefix
+        self.closed = True
+        self.open()
+
+    def open(self):
+        """Scan the static directory and build the routes (no-op if already open)"""
+        if not self.closed:
+            return
+        static_dir, api_prefix = self.static_dir, self.api_prefix
+        self.files: Mapping[str, StaticFile] = MappingProxyType(_scan_files(static_dir) if static_dir.is_dir() else {})
+
+        routes = {}
+        for rel_path, file in self.files.items():
+            cache_control = "no-cache" if rel_path.startswith("resume/") else "max-age=3600"
+            routes[f"/static/{rel_path}"] = _route(file, cache_control)
+            if rel_path.startswith("certifications/") and file.path.suffix.lower() in IMAGE_EXTENSIONS:
+                routes[f"{api_prefix}/static/{rel_path}"] = _route(
+                    file, "max-age=3600", f'attachment; filename="{file.path.name}"'
+                )
+
+        resume = self.files.get("resume/resume.pdf")
+        if resume is not None:
+            resume_route = _route(resume, "no-cache", "attachment; filename=resume.pdf")
+            routes[f"{api_prefix}/resume"] = resume_route
+            routes[f"{api_prefix}/static/resume/resume.pdf"] = resume_route
+
+        self.routes: Mapping[str, StaticRoute] = MappingProxyType(routes)
+        self.closed = False
+
+    def certifications(self) -> list:
+        """Certification images, sorted by filename"""
+        return [
+            {"filename": file.path.name, "url": f"/static/{rel_path}"}
+            for rel_path, file in sorted(self.files.items(), key=lambda item: item[1].path.name)
+            if rel_path.startswith("certifications/") and file.path.suffix.lower() in IMAGE_EXTENSIONS
+        ]
+
+    def close(self):
+        """Close cached file descriptors and empty the table until it is reopened"""
+        files = self.files
+        # Drop the routes first so no request can pick up a closed descriptor
+        self.files = MappingProxyType({})
+        self.routes = MappingProxyType({})
+        self.closed = True
+        for file in files.values():
+            if file.fd is not None:
+                try:
+                    os.close(file.fd)
+                except OSError:
+                    pass
+
+
+def _header(scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+def _not_modified(scope, file: StaticFile) -> bool:
+    if_none_match = _header(scope, b"if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.decode("latin-1").split(",")]
+        return "*" in tags or file.etag in tags or f"W/{file.etag}" in tags
+    if_modified_since = _header(scope, b"if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return int(file.mtime) <= parsedate_to_datetime(if_modified_since.decode("latin-1")).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _byte_range(scope, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single `bytes=` range; anything else is served in full"""
+    range_header = _header(scope, b"range")
+    if range_header is None:
+        return None
+    unit, _, spec = range_header.decode("latin-1").partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    start_s, _, end_s = spec.strip().partition("-")
+    try:
+        if start_s:
+            start = int(start_s)
+            end = min(int(end_s), size - 1) if end_s else size - 1
+        else:
+            start = max(size - int(end_s), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        return (-1, -1)
+    return (start, end)
+
+
+async def send_static_file(route: StaticRoute, scope, send):
+    """Send a static file response for a route table entry"""
+    file = route.file
+    headers = list(route.headers)
+
+    if _not_modified(scope, file):
+        await send({"type": "http.response.start", "status": 304, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+        return
+
+    start, end, status = 0, file.size - 1, 200
+    byte_range = _byte_range(scope, file.size)
+    if byte_range == (-1, -1):
+        headers.append((b"content-range", f"bytes */{file.size}".encode("latin-1")))
+        await send({"type": "http.response.start", "status": 416, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+        return
+    if byte_range is not None:
+        start, end = byte_range
+        status = 206
+        headers.append((b"content-range", f"bytes {start}-{end}/{file.size}".encode("latin-1")))
+
+    length = end - start + 1
+    headers.append((b"content-length", str(length).encode("latin-1")))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+
+    if scope["method"] == "HEAD":
+        await send({"type": "http.response.body", "body": b""})
+        return
+
+    if file.content is not None:
+        await send({"type": "http.response.body", "body": file.content[start:end + 1]})
+        return
+
+    offset = start
+    remaining = length
+    while remaining > 0:
+        with span("static.read"):
+            chunk = await asyncio.to_thread(os.pread, file.fd, min(CHUNK_SIZE, remaining), offset)
+        if not chunk:
+            break
+        offset += len(chunk)
+        remaining -= len(chunk)
+        await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+    if remaining > 0:
+        # File shrank since startup; end the response rather than hang
+        await send({"type": "http.response.body", "body": b""})
+
+
+class StaticFilesMiddleware:
+    """
+    ASGI middleware serving static files with one route table lookup
+    Requests for unknown URLs fall through to the application.
+    """
+
+    def __init__(self, app, table: StaticRouteTable):
+        self.app = app
+        self.table = table
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+            with span("static.lookup"):
+                route = self.table.routes.get(scope["path"])
+            if route is not None:
+                with span("static.send"):
+                    return await send_static_file(route, scope, send)
+        return await self.app(scope, receive, send)
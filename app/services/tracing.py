@@ -0,0 +1,290 @@
+# Lightweight request tracing with Server-Timing headers
+import functools
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextvars import ContextVar
+from typing import List, Optional
+
+from pymongo import monitoring
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    __slots__ = ("span_id", "parent_id", "name", "start_ns", "end_ns")
+
+    def __init__(self, span_id: str, parent_id: Optional[str], name: str, start_ns: int, end_ns: int):
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class Trace:
+    """Spans recorded while handling a single request"""
+
+    def __init__(self, sampled: bool):
+        self.trace_id = os.urandom(16).hex()
+        self.root_id = os.urandom(8).hex()
+        self.sampled = sampled
+        self.wall_start_ns = time.time_ns()
+        self.start_ns = time.perf_counter_ns()
+        self.spans: List[Span] = []
+
+    def add_span(self, name: str, start_ns: int, end_ns: int, parent_id: Optional[str] = None,
+                 span_id: Optional[str] = None):
+        # list.append is atomic, so spans may also be recorded from executor threads
+        self.spans.append(Span(span_id or os.urandom(8).hex(), parent_id or self.root_id,
+                               name, start_ns, end_ns))
+
+    def server_timing(self) -> str:
+        entries = [f"{s.name};dur={s.duration_ms:.2f}" for s in self.spans]
+        total_ms = (time.perf_counter_ns() - self.start_ns) / 1e6
+        entries.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(entries)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span_id: ContextVar[Optional[str]] = ContextVar("current_span_id", default=None)
+
+
+def get_current_trace() -> Optional[Trace]:
+    """Get the trace for the request being handled, if it is traced"""
+    return _current_trace.get()
+
+
+class span:
+    """
+    Time a block of code as a span of the current trace
+    Does nothing beyond a contextvar lookup when the request is not traced.
+    """
+    __slots__ = ("name", "trace", "span_id", "start_ns", "token")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.trace = _current_trace.get()
+        if self.trace is not None:
+            self.span_id = os.urandom(8).hex()
+            self.token = _current_span_id.set(self.span_id)
+            self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        if self.trace is not None:
+            end_ns = time.perf_counter_ns()
+            _current_span_id.reset(self.token)
+            self.trace.add_span(self.name, self.start_ns, end_ns,
+                                parent_id=_current_span_id.get(), span_id=self.span_id)
+        return False
+
+
+def traced(name: str):
+    """Decorator recording an async function call as a span"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return await fn(*args, **kwargs)
+            with span(name):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TracingMiddleware:
+    """ASGI middleware creating a trace per request and emitting Server-Timing"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        sampled = settings.tracing_sample_rate > 0 and random.random() < settings.tracing_sample_rate
+        if not sampled and not settings.tracing_server_timing:
+            return await self.app(scope, receive, send)
+
+        trace = Trace(sampled)
+        token = _current_trace.set(trace)
+        body_start_ns = None
+
+        async def send_with_timing(message):
+            nonlocal body_start_ns
+            if message["type"] == "http.response.start":
+                if settings.tracing_server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+                body_start_ns = time.perf_counter_ns()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_trace.reset(token)
+            end_ns = time.perf_counter_ns()
+            if body_start_ns is not None:
+                trace.add_span("response.body", body_start_ns, end_ns)
+            if trace.sampled:
+                route = scope.get("route")
+                name = f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+                export_trace(trace, name, end_ns)
+
+
+# Pymongo monitoring: Motor copies the context into its executor threads,
+# so these listeners see the trace of the request that issued the operation.
+class MongoTracingListener(monitoring.CommandListener, monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self._local = threading.local()
+
+    # Command round trips
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record_command(event)
+
+    def failed(self, event):
+        self._record_command(event)
+
+    def _record_command(self, event):
+        trace = _current_trace.get()
+        if trace is None:
+            return
+        end_ns = time.perf_counter_ns()
+        trace.add_span(f"mongo.{event.command_name}", end_ns - event.duration_micros * 1000, end_ns,
+                       parent_id=_current_span_id.get())
+
+    # Connection pool checkout
+    def connection_check_out_started(self, event):
+        if _current_trace.get() is not None:
+            self._local.checkout_start_ns = time.perf_counter_ns()
+
+    def connection_checked_out(self, event):
+        self._record_checkout()
+
+    def connection_check_out_failed(self, event):
+        self._record_checkout()
+
+    def _record_checkout(self):
+        trace = _current_trace.get()
+        start_ns = getattr(self._local, "checkout_start_ns", None)
+        if trace is None or start_ns is None:
+            return
+        self._local.checkout_start_ns = None
+        trace.add_span("mongo.pool_checkout", start_ns, time.perf_counter_ns(),
+                       parent_id=_current_span_id.get())
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_created(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_closed(self, event): pass
+    def connection_checked_in(self, event): pass
+
+
+def get_mongo_event_listeners() -> list:
+    """Event listeners to pass to the Mongo client (none when tracing is off)"""
+    if not settings.tracing_server_timing and settings.tracing_sample_rate <= 0:
+        return []
+    return [MongoTracingListener()]
+
+
+# Export of sampled traces happens on a background thread, off the response path
+_export_queue: "queue.Queue" = queue.Queue(maxsize=10000)
+_exporter_lock = threading.Lock()
+_exporter_thread: Optional[threading.Thread] = None
+
+
+def _to_otlp_span(trace: Trace, s: Span) -> dict:
+    offset = trace.wall_start_ns - trace.start_ns
+    return {
+        "traceId": trace.trace_id,
+        "spanId": s.span_id,
+        "parentSpanId": s.parent_id or "",
+        "name": s.name,
+        "kind": 1,
+        "startTimeUnixNano": str(s.start_ns + offset),
+        "endTimeUnixNano": str(s.end_ns + offset),
+    }
+
+
+def trace_to_otlp(trace: Trace, name: str, end_ns: int) -> dict:
+    """Convert a finished trace to an OTLP/JSON export request"""
+    root = Span(trace.root_id, None, name, trace.start_ns, end_ns)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": settings.tracing_service_name}}
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": __name__},
+                "spans": [_to_otlp_span(trace, s) for s in [root, *trace.spans]]
+            }]
+        }]
+    }
+
+
+def _export(payload: dict):
+    if settings.tracing_export_path:
+        with open(settings.tracing_export_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(payload) + "\n")
+    if settings.tracing_otlp_endpoint:
+        request = urllib.request.Request(
+            settings.tracing_otlp_endpoint,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=5):
+            pass
+
+
+def _exporter_loop():
+    while True:
+        payload = _export_queue.get()
+        try:
+            _export(payload)
+        except Exception as e:
+            logger.error(f"Error exporting trace: {e}")
+        finally:
+            _export_queue.task_done()
+
+
+def export_trace(trace: Trace, name: str, end_ns: int):
+    """Queue a sampled trace for export"""
+    global _exporter_thread
+    if not settings.tracing_export_path and not settings.tracing_otlp_endpoint:
+        return
+    if _exporter_thread is None:
+        with _exporter_lock:
+            if _exporter_thread is None:
+                _exporter_thread = threading.Thread(target=_exporter_loop, name="trace-exporter", daemon=True)
+                _exporter_thread.start()
+    try:
+        _export_queue.put_nowait(trace_to_otlp(trace, name, end_ns))
+    except queue.Full:
+        logger.warning("Trace export queue full, dropping trace")
+
+
+def flush_traces():
+    """Block until all queued traces have been exported"""
+    _export_queue.join()
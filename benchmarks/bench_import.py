@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the bulk contact import pipeline
+
+Streams a generated NDJSON or CSV body through import_contacts with the
+database insert replaced by a no-op, measuring parse + validation
+throughput (the part of an import that runs in this process).
+
+Usage: python benchmarks/bench_import.py [records] [ndjson|csv]
+"""
+import asyncio
+import csv
+import io
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services import contact_import  # noqa: E402
+
+CHUNK_SIZE = 64 * 1024
+
+
+def build_body(records: int, file_format: str) -> bytes:
+    rows = [
+        {
+            "name": f"Person {i}",
+            "email": f"person{i}@example.com",
+            "subject": "Historical enquiry",
+            "message": f"Hello, this is migrated message number {i}.",
+            "created_at": "2021-03-04T05:06:07",
+        }
+        for i in range(records)
+    ]
+    if file_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().encode()
+    return "\n".join(json.dumps(row) for row in rows).encode()
+
+
+async def chunks(body: bytes):
+    for i in range(0, len(body), CHUNK_SIZE):
+        yield body[i:i + CHUNK_SIZE]
+
+
+async def noop_insert(documents):
+    return len(documents), []
+
+
+async def main(records: int, file_format: str):
+    body = build_body(records, file_format)
+    contact_import.insert_contacts = noop_insert
+    result = await contact_import.import_contacts(chunks(body), file_format, batch_size=1000, concurrency=4)
+    assert result["inserted"] == records, {k: v for k, v in result.items() if k != "errors"}
+    rate = result["records_per_second"]
+    print(f"{file_format}: {records} records in {result['duration_seconds']}s "
+          f"({rate:.0f} records/s, ~{1_000_000 / rate / 60:.1f} min per million)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        sys.argv[2] if len(sys.argv) > 2 else "ndjson",
+    ))
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for static file serving
+
+Compares, in-process at the ASGI level (no network):
+- legacy_route: the previous per-request route (path join, exists/is_file,
+  media type dict, FileResponse)
+- legacy_mount: Starlette's StaticFiles mount previously used for /static
+- route_table: StaticFilesMiddleware with the startup-built route table
+
+for two files:
+- memory: react_1.jpg (253,019 bytes), under STATIC_MEMORY_CACHE_MAX_BYTES,
+  so the route table serves it from memory
+- fd: a generated 2 MiB jpg, over the threshold, so the route table serves
+  it from a cached descriptor with os.pread per 64 KiB chunk
+
+Usage: python benchmarks/bench_static.py [requests]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI, HTTPException  # noqa: E402
+from fastapi.responses import FileResponse  # noqa: E402
+from fastapi.staticfiles import StaticFiles  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.services.static_files import StaticFilesMiddleware, StaticRouteTable  # noqa: E402
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "app" / "static"
+FILENAME = "react_1.jpg"
+LARGE_FILE_SIZE = 2 * 1024 * 1024
+
+
+def legacy_route_app(static_dir: Path, filename: str):
+    app = FastAPI()
+
+    @app.get("/api/v1/static/certifications/{filename}")
+    async def serve_certification(filename: str):
+        cert_path = static_dir / "certifications" / filename
+        if not cert_path.exists() or not cert_path.is_file():
+            raise HTTPException(status_code=404)
+        media_type_map = {
+            '.png': 'image/png',
+            '.jpg': 'image/jpeg',
+            '.jpeg': 'image/jpeg',
+            '.gif': 'image/gif',
+            '.webp': 'image/webp',
+            '.svg': 'image/svg+xml'
+        }
+        media_type = media_type_map.get(cert_path.suffix.lower(), 'application/octet-stream')
+        return FileResponse(path=str(cert_path), filename=filename, media_type=media_type,
+                            headers={"Cache-Control": "max-age=3600"})
+
+    return app, f"/api/v1/static/certifications/{filename}"
+
+
+def legacy_mount_app(static_dir: Path, filename: str):
+    app = FastAPI()
+    app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+    return app, f"/static/certifications/{filename}"
+
+
+def route_table_app(static_dir: Path, filename: str):
+    app = FastAPI()
+    app.add_middleware(StaticFilesMiddleware, table=StaticRouteTable(static_dir, "/api/v1"))
+    return app, f"/api/v1/static/certifications/{filename}"
+
+
+async def run(app, path: str, requests: int, expected_size: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status = {}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+            status["size"] = 0
+        elif message["type"] == "http.response.body":
+            status["size"] += len(message.get("body", b""))
+
+    # Warm up (also builds the middleware stack)
+    for _ in range(50):
+        await app(dict(scope), receive, send)
+    assert status["code"] == 200 and status["size"] == expected_size, status
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return requests / (time.perf_counter() - start)
+
+
+async def compare(label: str, static_dir: Path, filename: str, requests: int):
+    size = (static_dir / "certifications" / filename).stat().st_size
+    served_from = "memory" if size <= settings.static_memory_cache_max_bytes else "fd + os.pread"
+    print(f"{label}: {filename} ({size:,} bytes, route table serves from {served_from})")
+
+    results = {}
+    for name, factory in [("legacy_route", legacy_route_app),
+                          ("legacy_mount", legacy_mount_app),
+                          ("route_table", route_table_app)]:
+        app, path = factory(static_dir, filename)
+        results[name] = await run(app, path, requests, size)
+
+    for name, rps in results.items():
+        print(f"{name:>14}: {rps:10.0f} req/s  ({rps / results['legacy_route']:.1f}x legacy_route)")
+
+
+async def main(requests: int):
+    await compare("memory", STATIC_DIR, FILENAME, requests)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        static_dir = Path(tmp)
+        (static_dir / "certifications").mkdir()
+        (static_dir / "certifications" / "large.jpg").write_bytes(os.urandom(LARGE_FILE_SIZE))
+        await compare("fd", static_dir, "large.jpg", max(requests // 10, 100))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
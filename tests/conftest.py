@@ -0,0 +1,108 @@
+import pytest
+from bson import ObjectId
+from pymongo import DeleteOne, InsertOne, ReplaceOne
+from pymongo.errors import CollectionInvalid
+
+from app.services.db import mongodb
+
+
+def _matches(doc, query):
+    for key, condition in query.items():
+        value = doc.get(key)
+        if isinstance(condition, dict):
+            for op, operand in condition.items():
+                if op == "$lt" and not (value is not None and value < operand):
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def sort(self, key, direction):
+        self._docs = sorted(self._docs, key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def skip(self, n):
+        self._docs = self._docs[n:]
+        return self
+
+    def limit(self, n):
+        self._docs = self._docs[:n]
+        return self
+
+    async def to_list(self, length=None):
+        return [dict(d) for d in self._docs[:length]]
+
+
+class FakeResult:
+    def __init__(self, inserted_id=None, inserted_ids=None):
+        self.inserted_id = inserted_id
+        self.inserted_ids = inserted_ids
+
+
+class FakeCollection:
+    """Minimal in-memory stand-in for a Motor collection"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def create_index(self, *args, **kwargs):
+        return None
+
+    async def insert_one(self, doc):
+        doc.setdefault("_id", ObjectId())
+        self.docs[doc["_id"]] = dict(doc)
+        return FakeResult(doc["_id"])
+
+    async def insert_many(self, docs, ordered=True):
+        ids = []
+        for doc in docs:
+            ids.append((await self.insert_one(doc)).inserted_id)
+        return FakeResult(inserted_ids=ids)
+
+    def find(self, query=None):
+        query = query or {}
+        return FakeCursor([d for d in self.docs.values() if _matches(d, query)])
+
+    async def bulk_write(self, requests, ordered=True):
+        for request in requests:
+            if isinstance(request, InsertOne):
+                doc = request._doc
+                doc.setdefault("_id", ObjectId())
+                self.docs[doc["_id"]] = dict(doc)
+            elif isinstance(request, ReplaceOne):
+                self.docs[request._filter["_id"]] = dict(request._doc)
+            elif isinstance(request, DeleteOne):
+                self.docs.pop(request._filter["_id"], None)
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.collections = {}
+
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, FakeCollection())
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    async def create_collection(self, name, **kwargs):
+        if name in self.collections:
+            raise CollectionInvalid(f"collection {name} already exists")
+        return self[name]
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """Replace the Mongo database with an in-memory fake"""
+    db = FakeDatabase()
+    monkeypatch.setattr(mongodb, "database", db)
+    return db
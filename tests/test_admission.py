@@ -0,0 +1,224 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pymongo.errors import AutoReconnect, NetworkTimeout
+
+from app.config import settings
+from app.main import app
+from app.services.admission import (
+    AdaptiveLimiter,
+    AdmissionControlMiddleware,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from app.services.db import db_breaker
+
+client = TestClient(app)
+
+
+def _limiter(**kwargs):
+    options = dict(initial_limit=2, min_limit=1, max_limit=10, latency_target=0.1,
+                   queue_timeout=0.05, max_queue=1)
+    options.update(kwargs)
+    return AdaptiveLimiter("test", **options)
+
+
+def test_limiter_sheds_after_queue_deadline():
+    """Test requests over the limit wait, then are shed at the deadline"""
+    async def scenario():
+        limiter = _limiter()
+        assert await limiter.acquire()
+        assert await limiter.acquire()
+        # Queue holds one waiter; the next request is shed immediately
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not await limiter.acquire()
+        assert not await queued
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter.stats["shed"] == 2
+    assert limiter.in_flight == 2
+
+
+def test_limiter_hands_slot_to_waiter():
+    """Test a released slot goes to the next queued request"""
+    async def scenario():
+        limiter = _limiter(initial_limit=1, queue_timeout=1.0)
+        assert await limiter.acquire()
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        limiter.release(0.01)
+        assert await queued
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter.in_flight == 1
+    assert not limiter.waiters
+
+
+def test_limiter_aimd():
+    """Test the limit grows with fast saturated completions and is cut on slow ones"""
+    limiter = _limiter(initial_limit=4)
+    limiter.in_flight = 4
+    limiter.release(0.01)
+    assert limiter.limit == pytest.approx(4.25)
+
+    limiter.in_flight = 4
+    limiter.release(1.0)
+    assert limiter.limit == pytest.approx(4.25 * 0.7)
+
+    # A second slow completion in the same window does not cut again
+    limiter.in_flight = 2
+    limiter.release(1.0)
+    assert limiter.limit == pytest.approx(4.25 * 0.7)
+
+
+def test_limiter_grows_concurrency_under_standing_queue():
+    """Test a raised limit admits more queued requests, not just the limit number"""
+    async def scenario():
+        limiter = _limiter(initial_limit=2, queue_timeout=5.0, max_queue=20)
+        assert await limiter.acquire()
+        assert await limiter.acquire()
+        queued = [asyncio.create_task(limiter.acquire()) for _ in range(10)]
+        await asyncio.sleep(0)
+
+        for _ in range(6):
+            limiter.release(0.01)
+            await asyncio.sleep(0)
+
+        in_flight, limit = limiter.in_flight, int(limiter.limit)
+        for task in queued:
+            task.cancel()
+        await asyncio.gather(*queued, return_exceptions=True)
+        return in_flight, limit
+
+    in_flight, limit = asyncio.run(scenario())
+    assert limit == 4
+    assert in_flight == limit
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """Test the breaker opens after repeated failures and closes after a good probe"""
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10,
+                             failure_exceptions=(AutoReconnect,))
+    outcomes = [AutoReconnect("down"), AutoReconnect("down"), "ok"]
+
+    @breaker
+    async def call():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    for _ in range(2):
+        with pytest.raises(AutoReconnect):
+            asyncio.run(call())
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(call())
+    assert len(outcomes) == 1
+
+    # After the reset timeout a probe is let through and closes the circuit
+    breaker.opened_at -= 10
+    assert asyncio.run(call()) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_circuit_breaker_ignores_other_errors():
+    """Test non-database errors don't open the breaker"""
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10,
+                             failure_exceptions=(AutoReconnect,))
+
+    @breaker
+    async def call():
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        asyncio.run(call())
+    assert breaker.state == "closed"
+
+
+def test_middleware_sheds_with_retry_after():
+    """Test saturated route classes get a fast 503 with Retry-After"""
+    test_app = FastAPI()
+
+    @test_app.get("/db")
+    async def db_route():
+        return {"ok": True}
+
+    limiter = _limiter(initial_limit=0, min_limit=0, queue_timeout=0)
+    test_app.add_middleware(AdmissionControlMiddleware, classify=lambda path: "db",
+                            limiters={"db": limiter})
+
+    response = TestClient(test_app).get("/db")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_middleware_ignores_slow_body_download():
+    """Test latency is measured to the response start, not the end of the body"""
+    async def slow_body_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        # Stands in for a slow client draining the body
+        await asyncio.sleep(0.3)
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def send(message):
+        pass
+
+    limiter = _limiter(initial_limit=4)
+    middleware = AdmissionControlMiddleware(slow_body_app, classify=lambda path: "db",
+                                            limiters={"db": limiter})
+    asyncio.run(middleware({"type": "http", "path": "/db"}, None, send))
+
+    assert limiter.limit == pytest.approx(4)
+    assert limiter.in_flight == 0
+
+
+def test_open_circuit_sheds_db_routes_only(monkeypatch):
+    """Test static serving keeps working while the database circuit is open"""
+    monkeypatch.setattr(db_breaker, "state", "open")
+    monkeypatch.setattr(db_breaker, "opened_at", time.monotonic())
+
+    response = client.get("/api/v1/contact/admin/all")
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) >= 1
+
+    response = client.get("/static/certifications/react_1.jpg")
+    assert response.status_code == 200
+
+
+def test_open_circuit_in_handler_returns_503(monkeypatch):
+    """Test database calls rejected by the breaker map to 503"""
+    monkeypatch.setattr(settings, "admission_enabled", False)
+    monkeypatch.setattr(db_breaker, "state", "open")
+    monkeypatch.setattr(db_breaker, "opened_at", time.monotonic())
+
+    response = client.get("/api/v1/contact/admin/all")
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
+
+
+def test_db_timeout_returns_503_without_resubmit(monkeypatch, fake_db):
+    """Test a timed-out contact insert tells the visitor not to resubmit"""
+    async def insert_one(doc):
+        raise NetworkTimeout("timed out")
+
+    monkeypatch.setattr(fake_db.contacts, "insert_one", insert_one)
+    monkeypatch.setattr(db_breaker, "failures", 0)
+    contact_data = {
+        "name": "John Doe",
+        "email": "john@example.com",
+        "subject": "Test Subject",
+        "message": "This is a test message"
+    }
+
+    response = client.post("/api/v1/contact", json=contact_data)
+    assert response.status_code == 503
+    assert "may already have been received" in response.json()["detail"]
+    # Driver timeouts count towards opening the circuit
+    assert db_breaker.failures == 1
@@ -0,0 +1,137 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.config import Settings, settings
+from app.main import app
+from app.services import archive
+from app.services.archive import archive_expired_contacts, get_archived_contacts
+
+client = TestClient(app)
+
+NOW = datetime(2026, 1, 1)
+
+
+def _seed(db, ages_in_days):
+    for age in ages_in_days:
+        doc = {
+            "_id": ObjectId(),
+            "name": "John Doe",
+            "email": "john@example.com",
+            "subject": "Test Subject",
+            "message": f"Sent {age} days ago",
+            "created_at": NOW - timedelta(days=age),
+        }
+        db.contacts.docs[doc["_id"]] = doc
+
+
+@pytest.fixture
+def archive_settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "archive_after_days", 30)
+    monkeypatch.setattr(settings, "archive_batch_size", 2)
+    monkeypatch.setattr(settings, "archive_batch_pause_seconds", 0)
+    monkeypatch.setattr(settings, "archive_dir", str(tmp_path))
+    return tmp_path
+
+
+def test_archive_to_collection(fake_db, archive_settings, monkeypatch):
+    """Test expired contacts move to the archive collection in batches"""
+    monkeypatch.setattr(settings, "archive_backend", "collection")
+    _seed(fake_db, [1, 10, 40, 50, 60])
+
+    archived = asyncio.run(archive_expired_contacts(now=NOW))
+
+    assert archived == 3
+    assert len(fake_db.contacts.docs) == 2
+    assert len(fake_db[settings.archive_collection_name].docs) == 3
+
+    contacts = asyncio.run(get_archived_contacts(skip=0, limit=10))
+    assert [c["message"] for c in contacts] == [
+        "Sent 40 days ago", "Sent 50 days ago", "Sent 60 days ago"
+    ]
+
+
+def test_archive_to_files(fake_db, archive_settings, monkeypatch):
+    """Test expired contacts move to gzip NDJSON files in batches"""
+    monkeypatch.setattr(settings, "archive_backend", "file")
+    _seed(fake_db, [1, 40, 50, 60])
+
+    archived = asyncio.run(archive_expired_contacts(now=NOW))
+
+    assert archived == 3
+    assert len(fake_db.contacts.docs) == 1
+    assert len(list(archive_settings.glob("*.ndjson.gz"))) == 2
+
+    contacts = asyncio.run(get_archived_contacts(skip=1, limit=10))
+    assert [c["message"] for c in contacts] == ["Sent 50 days ago", "Sent 60 days ago"]
+    assert isinstance(contacts[0]["created_at"], datetime)
+    assert isinstance(contacts[0]["_id"], ObjectId)
+
+
+def test_archive_files_skipped_via_index(fake_db, archive_settings, monkeypatch):
+    """Test pagination skips whole archive files without reading them"""
+    monkeypatch.setattr(settings, "archive_backend", "file")
+    _seed(fake_db, [40, 50, 60, 70, 80])
+    asyncio.run(archive_expired_contacts(now=NOW))
+
+    read = []
+    read_lines = archive._read_lines
+    monkeypatch.setattr(archive, "_read_lines", lambda path: read.append(path) or read_lines(path))
+
+    contacts = asyncio.run(get_archived_contacts(skip=3, limit=1))
+    assert [c["message"] for c in contacts] == ["Sent 70 days ago"]
+    # Newest file (1 record) and the next (2 records) are skipped by count
+    assert len(read) == 1
+
+
+def test_archive_files_without_index(fake_db, archive_settings, monkeypatch):
+    """Test archive files missing from the index are still read"""
+    monkeypatch.setattr(settings, "archive_backend", "file")
+    _seed(fake_db, [40, 50, 60])
+    asyncio.run(archive_expired_contacts(now=NOW))
+    (archive_settings / archive.ARCHIVE_INDEX_NAME).unlink()
+
+    contacts = asyncio.run(get_archived_contacts(skip=1, limit=10))
+    assert [c["message"] for c in contacts] == ["Sent 50 days ago", "Sent 60 days ago"]
+
+
+def test_invalid_archive_backend():
+    """Test unknown archive backends are rejected at startup"""
+    with pytest.raises(ValidationError):
+        Settings(archive_backend="s3")
+
+
+def test_archive_nothing_expired(fake_db, archive_settings):
+    """Test an archival pass with no expired contacts is a no-op"""
+    _seed(fake_db, [1, 2])
+
+    assert asyncio.run(archive_expired_contacts(now=NOW)) == 0
+    assert len(fake_db.contacts.docs) == 2
+
+
+def test_archive_admin_endpoint(fake_db, archive_settings, monkeypatch):
+    """Test admin endpoint for reading archived contacts"""
+    monkeypatch.setattr(settings, "archive_backend", "file")
+    _seed(fake_db, [40])
+    asyncio.run(archive_expired_contacts(now=NOW))
+
+    response = client.get("/api/v1/contact/admin/archive")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["total"] == 1
+    assert isinstance(data["contacts"][0]["_id"], str)
+
+
+def test_archive_status_endpoint():
+    """Test admin endpoint reporting archiver status"""
+    response = client.get("/api/v1/contact/admin/archive/status")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert "enabled" in data
+    assert "running" in data
@@ -0,0 +1,234 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from app.config import settings
+from app.main import app
+from app.services.contact_import import import_contacts, import_state
+from app.services.db import db_breaker
+
+client = TestClient(app)
+
+
+def _record(i, **overrides):
+    record = {
+        "name": f"Person {i}",
+        "email": f"person{i}@example.com",
+        "subject": "Old enquiry",
+        "message": f"Message {i}",
+    }
+    record.update(overrides)
+    return record
+
+
+async def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def test_import_ndjson(fake_db):
+    """Test NDJSON import in batches with a per-record error report"""
+    lines = [json.dumps(_record(i)) for i in range(25)]
+    lines[3] = json.dumps(_record(3, email="not-an-email"))
+    lines[7] = "{not json"
+    body = "\n".join(lines).encode()
+
+    response = client.post(
+        "/api/v1/contact/admin/import?batch_size=10&concurrency=2",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["received"] == 25
+    assert data["inserted"] == 23
+    assert data["invalid"] == 2
+    assert [e["record"] for e in data["errors"]] == [4, 8]
+    assert data["errors"][0]["errors"][0].startswith("email:")
+    assert data["records_per_second"] > 0
+    assert len(fake_db.contacts.docs) == 23
+
+
+def test_import_csv_with_multiline_fields(fake_db):
+    """Test CSV import with quoted multi-line fields and original timestamps"""
+    body = (
+        "name,email,subject,message,created_at\r\n"
+        "Jane,jane@example.com,Hello,\"First line\nsecond line\",2020-05-01T10:00:00\r\n"
+        "<b></b>,bob@example.com,Hi,Message,\r\n"
+        "Ann,ann@example.com,Hey,\"Quote \"\"here\"\"\",\r\n"
+    ).encode()
+
+    response = client.post(
+        "/api/v1/contact/admin/import",
+        content=body,
+        headers={"Content-Type": "text/csv"}
+    )
+    data = response.json()
+    assert data["inserted"] == 2
+    assert data["invalid"] == 1
+    assert data["errors"][0]["record"] == 4
+
+    docs = sorted(fake_db.contacts.docs.values(), key=lambda d: d["name"])
+    assert docs[0]["message"] == 'Quote "here"'
+    assert docs[1]["message"] == "First line\nsecond line"
+    assert docs[1]["created_at"] == datetime(2020, 5, 1, 10, 0)
+
+
+def test_import_csv_stray_quote(fake_db):
+    """Test a quote inside an unquoted field does not swallow later rows"""
+    body = (
+        "name,email,subject,message\n"
+        "Jane,jane@example.com,Monitor,I want a 27\" screen\n"
+        + "".join(f"Person {i},person{i}@example.com,Hi,Message {i}\n" for i in range(5))
+    ).encode()
+
+    response = client.post(
+        "/api/v1/contact/admin/import",
+        content=body,
+        headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["inserted"] == 6
+    assert data["errors"] == []
+    assert data["aborted"] is None
+    jane = next(d for d in fake_db.contacts.docs.values() if d["name"] == "Jane")
+    assert jane["message"] == 'I want a 27" screen'
+
+
+def test_import_oversized_records_are_skipped(fake_db, monkeypatch):
+    """Test oversized and unterminated records are per-record errors"""
+    monkeypatch.setattr(settings, "import_max_record_bytes", 200)
+    body = (
+        "name,email,subject,message\n"
+        "Jane,jane@example.com,Hi,Fine\n"
+        f"Bob,bob@example.com,Hi,{'x' * 500}\n"
+        "Ann,ann@example.com,Hi,\"never closed\n"
+        + "".join(f"Person {i},person{i}@example.com,Hi,Message {i}\n" for i in range(10))
+    ).encode()
+
+    result = asyncio.run(import_contacts(_chunks(body, 64), "csv", batch_size=10, concurrency=1))
+
+    assert result["aborted"] is None
+    assert [e["record"] for e in result["errors"]] == [3, 4]
+    assert all("exceeds 200 bytes" in e["errors"][0] for e in result["errors"])
+    # The unterminated record absorbs lines until it hits the limit, then
+    # parsing resumes with the following rows
+    assert result["inserted"] == 7
+    assert "Person 9" in {d["name"] for d in fake_db.contacts.docs.values()}
+
+
+@pytest.mark.parametrize("chunk_size", [64, 64 * 1024])
+def test_import_record_limit_independent_of_chunking(fake_db, monkeypatch, chunk_size):
+    """Test oversized lines are rejected whether they arrive split or in one chunk"""
+    monkeypatch.setattr(settings, "import_max_record_bytes", 200)
+    lines = [json.dumps(_record(i, message="x" * 1500)) for i in range(2)]
+    # 60 two-byte characters: 150 characters but over 200 bytes
+    lines.append(json.dumps(_record(2, message="é" * 60), ensure_ascii=False))
+    lines.append(json.dumps(_record(3)))
+    body = "\n".join(lines).encode()
+
+    result = asyncio.run(import_contacts(_chunks(body, chunk_size), "ndjson", batch_size=10, concurrency=1))
+
+    assert result["inserted"] == 1
+    assert [e["record"] for e in result["errors"]] == [1, 2, 3]
+    assert all(e["errors"] == ["Record exceeds 200 bytes"] for e in result["errors"])
+
+
+def test_import_returns_report_when_aborted(fake_db):
+    """Test an unreadable upload still reports what was imported"""
+    async def chunks():
+        yield "\n".join(json.dumps(_record(i)) for i in range(3)).encode() + b"\n"
+        raise ConnectionResetError("client disconnected")
+
+    result = asyncio.run(import_contacts(chunks(), "ndjson", batch_size=2, concurrency=1))
+
+    assert result["inserted"] == 3
+    assert result["aborted"] == "client disconnected"
+
+
+def test_import_streams_small_chunks(fake_db):
+    """Test records split across arbitrary chunk boundaries, including UTF-8"""
+    body = "\n".join(json.dumps(_record(i, name=f"Zoë {i}")) for i in range(50)).encode()
+
+    result = asyncio.run(import_contacts(_chunks(body, 7), "ndjson", batch_size=8, concurrency=3))
+
+    assert result["inserted"] == 50
+    assert {d["name"] for d in fake_db.contacts.docs.values()} == {f"Zoë {i}" for i in range(50)}
+
+
+def test_import_reports_write_errors(fake_db, monkeypatch):
+    """Test write errors from insert_many map back to record numbers"""
+    async def insert_many(docs, ordered=True):
+        assert ordered is False
+        raise BulkWriteError({
+            "nInserted": len(docs) - 1,
+            "writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key"}]
+        })
+
+    monkeypatch.setattr(fake_db.contacts, "insert_many", insert_many)
+    body = "\n".join(json.dumps(_record(i)) for i in range(3)).encode()
+
+    result = asyncio.run(import_contacts(_chunks(body, 1024), "ndjson", batch_size=10, concurrency=1))
+
+    assert result["inserted"] == 2
+    assert result["failed"] == 1
+    assert result["errors"] == [{"record": 2, "errors": ["duplicate key"]}]
+
+
+def test_import_concurrency_is_capped(fake_db, monkeypatch):
+    """Test requested concurrency is capped well below the connection pool"""
+    in_flight = max_in_flight = 0
+    insert_many = fake_db.contacts.insert_many
+
+    async def slow_insert_many(docs, ordered=True):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return await insert_many(docs, ordered=ordered)
+
+    monkeypatch.setattr(fake_db.contacts, "insert_many", slow_insert_many)
+    body = "\n".join(json.dumps(_record(i)) for i in range(40)).encode()
+
+    response = client.post("/api/v1/contact/admin/import?batch_size=2&concurrency=32", content=body)
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 40
+    assert max_in_flight == settings.import_max_concurrency
+
+
+def test_import_rejects_concurrent_imports(monkeypatch):
+    """Test only one import runs at a time"""
+    monkeypatch.setattr(import_state, "running", True)
+    response = client.post("/api/v1/contact/admin/import", content=b"")
+    assert response.status_code == 409
+
+
+def test_import_failures_do_not_trip_breaker(fake_db, monkeypatch):
+    """Test failing import batches leave the shared database breaker alone"""
+    async def insert_many(docs, ordered=True):
+        raise AutoReconnect("connection reset")
+
+    monkeypatch.setattr(fake_db.contacts, "insert_many", insert_many)
+    monkeypatch.setattr(db_breaker, "failures", 0)
+    body = "\n".join(json.dumps(_record(i)) for i in range(30)).encode()
+
+    result = asyncio.run(import_contacts(_chunks(body, 1024), "ndjson", batch_size=5, concurrency=2))
+
+    assert result["failed"] == 30
+    assert db_breaker.failures == 0
+    assert not db_breaker.is_open
+    assert import_state.running is False
+
+
+def test_import_rejects_unknown_format():
+    """Test unsupported upload formats are rejected"""
+    response = client.post("/api/v1/contact/admin/import?format=xml", content=b"<x/>")
+    assert response.status_code == 400
@@ -0,0 +1,149 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.services import diagnostics
+from app.services.diagnostics import LoopMonitor, stop_tracemalloc
+
+client = TestClient(app)
+
+TOKEN = "test-token"
+HEADERS = {"X-Diagnostics-Token": TOKEN}
+
+
+@pytest.fixture
+def diagnostics_enabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "diagnostics_enabled", True)
+    monkeypatch.setattr(settings, "diagnostics_token", TOKEN)
+    monkeypatch.setattr(settings, "diagnostics_dir", str(tmp_path))
+    yield tmp_path
+    stop_tracemalloc()
+
+
+def test_diagnostics_hidden_when_disabled():
+    """Test diagnostics endpoints don't exist unless enabled"""
+    response = client.get("/api/v1/diagnostics", headers=HEADERS)
+    assert response.status_code == 404
+
+
+def test_diagnostics_requires_token(diagnostics_enabled):
+    """Test diagnostics endpoints require the admin token"""
+    assert client.get("/api/v1/diagnostics").status_code == 403
+    assert client.get("/api/v1/diagnostics", headers={"X-Diagnostics-Token": "wrong"}).status_code == 403
+
+    response = client.get("/api/v1/diagnostics", headers=HEADERS)
+    assert response.status_code == 200
+    data = response.json()
+    assert {"tracemalloc", "gc", "loop"} <= set(data)
+
+
+def test_tracemalloc_snapshot_and_diff(diagnostics_enabled):
+    """Test allocation tracing can be toggled and diffed at runtime"""
+    assert client.post("/api/v1/diagnostics/tracemalloc/snapshots", headers=HEADERS).status_code == 409
+
+    response = client.post("/api/v1/diagnostics/tracemalloc/start", headers=HEADERS)
+    assert response.json()["tracing"] is True
+
+    base = client.post("/api/v1/diagnostics/tracemalloc/snapshots", headers=HEADERS).json()["id"]
+    leak = [bytearray(1024) for _ in range(1000)]  # noqa: F841
+
+    response = client.get(f"/api/v1/diagnostics/tracemalloc/diff?base={base}", headers=HEADERS)
+    assert response.status_code == 200
+    assert any(entry["size_diff_kb"] >= 1000 for entry in response.json()["diff"])
+
+    response = client.get("/api/v1/diagnostics/tracemalloc/top?limit=5", headers=HEADERS)
+    assert len(response.json()["top"]) == 5
+
+    response = client.post("/api/v1/diagnostics/tracemalloc/stop", headers=HEADERS)
+    assert response.json()["tracing"] is False
+
+
+def test_tracemalloc_rejects_bad_parameters(diagnostics_enabled):
+    """Test invalid tracemalloc options are client errors, not 500s"""
+    response = client.post("/api/v1/diagnostics/tracemalloc/start?frames=0", headers=HEADERS)
+    assert response.status_code == 422
+
+    client.post("/api/v1/diagnostics/tracemalloc/start", headers=HEADERS)
+    response = client.get("/api/v1/diagnostics/tracemalloc/top?group_by=bogus", headers=HEADERS)
+    assert response.status_code == 422
+    response = client.get("/api/v1/diagnostics/tracemalloc/diff?base=1&group_by=bogus", headers=HEADERS)
+    assert response.status_code == 422
+
+
+def test_loop_monitor_rejects_bad_parameters(diagnostics_enabled):
+    """Test the loop monitor can't be started with a busy-looping interval"""
+    for query in ["interval=0", "interval=-1", "slow_callback_ms=0"]:
+        response = client.post(f"/api/v1/diagnostics/loop/start?{query}", headers=HEADERS)
+        assert response.status_code == 422
+
+    with pytest.raises(ValueError):
+        LoopMonitor().start(interval=0)
+
+
+def test_gc_stats(diagnostics_enabled):
+    """Test garbage collector statistics and forced collection"""
+    response = client.get("/api/v1/diagnostics/gc?object_types=5", headers=HEADERS)
+    assert response.status_code == 200
+    assert len(response.json()["object_types"]) == 5
+
+    response = client.post("/api/v1/diagnostics/gc/collect", headers=HEADERS)
+    assert "collected" in response.json()
+
+    response = client.get("/api/v1/diagnostics/gc?object_types=1000", headers=HEADERS)
+    assert response.status_code == 422
+
+
+def test_heavy_diagnostics_run_off_the_event_loop(diagnostics_enabled, monkeypatch):
+    """Test snapshots, grouping, diffs and object counts don't block the loop"""
+    calls = []
+
+    def off_loop(name, result):
+        def fn(*args, **kwargs):
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            calls.append(name)
+            return result
+        return fn
+
+    monkeypatch.setattr(diagnostics, "take_snapshot", off_loop("snapshot", 1))
+    monkeypatch.setattr(diagnostics, "top_allocations", off_loop("top", []))
+    monkeypatch.setattr(diagnostics, "diff_snapshots", off_loop("diff", []))
+    monkeypatch.setattr(diagnostics, "gc_stats", off_loop("gc", {}))
+
+    assert client.post("/api/v1/diagnostics/tracemalloc/snapshots", headers=HEADERS).status_code == 200
+    assert client.get("/api/v1/diagnostics/tracemalloc/top", headers=HEADERS).status_code == 200
+    assert client.get("/api/v1/diagnostics/tracemalloc/diff?base=1", headers=HEADERS).status_code == 200
+    assert client.get("/api/v1/diagnostics/gc?object_types=5", headers=HEADERS).status_code == 200
+    assert calls == ["snapshot", "top", "diff", "gc"]
+
+
+def test_cpu_profile_dumped_to_disk(diagnostics_enabled):
+    """Test on-demand CPU profiles are written as collapsed stacks"""
+    response = client.post("/api/v1/diagnostics/profile?seconds=0.2&interval_ms=5", headers=HEADERS)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["samples"] > 0
+    lines = open(data["path"]).read().splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_loop_monitor_detects_lag_and_slow_callbacks():
+    """Test the loop monitor measures lag and records slow callbacks"""
+    async def scenario():
+        monitor = LoopMonitor()
+        monitor.start(interval=0.01, slow_callback_ms=20)
+        await asyncio.sleep(0.03)
+        time.sleep(0.05)  # Block the loop
+        await asyncio.sleep(0.03)
+        stats = monitor.stats()
+        monitor.stop()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats["max_lag_ms"] >= 30
+    assert stats["slow_callbacks"]
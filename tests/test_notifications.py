@@ -0,0 +1,264 @@
+import asyncio
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from app.config import settings
+from app.services import notifications
+from app.services.notifications import (
+    NotificationQueue,
+    NotificationSink,
+    WebhookSink,
+    start_notification_workers,
+    stop_notification_workers,
+)
+
+PAYLOAD = {
+    "id": "abc123",
+    "name": "John Doe",
+    "email": "john@example.com",
+    "subject": "Test Subject",
+    "message": "This is a test message",
+    "created_at": datetime(2026, 1, 1).isoformat(),
+}
+
+
+class RecordingSink(NotificationSink):
+    """Local sink that fails a fixed number of times before succeeding"""
+
+    def __init__(self, name="recording", failures=0, delay=0.0):
+        self.name = name
+        self.failures = failures
+        self.delay = delay
+        self.received = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send(self, payload):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures > 0:
+                self.failures -= 1
+                raise RuntimeError("sink unavailable")
+            self.received.append(payload)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "notification_backoff_base_seconds", 0.001)
+    monkeypatch.setattr(settings, "notification_backoff_max_seconds", 0.01)
+    monkeypatch.setattr(settings, "notification_max_attempts", 3)
+
+
+async def _run(queue, payloads, settle=0.2):
+    queue.start()
+    for payload in payloads:
+        queue.enqueue(payload)
+    await asyncio.sleep(settle)
+    await queue.stop()
+
+
+def test_fan_out_to_all_sinks(fast_retries):
+    """Test every registered sink receives the notification"""
+    queue = NotificationQueue()
+    sinks = [RecordingSink("a"), RecordingSink("b")]
+    for sink in sinks:
+        queue.register_sink(sink)
+
+    asyncio.run(_run(queue, [PAYLOAD]))
+
+    assert all(sink.received == [PAYLOAD] for sink in sinks)
+    assert queue.stats["delivered"] == 2
+
+
+def test_retry_then_deliver(fast_retries):
+    """Test failed deliveries are retried with backoff"""
+    queue = NotificationQueue()
+    sink = RecordingSink(failures=2)
+    queue.register_sink(sink)
+
+    asyncio.run(_run(queue, [PAYLOAD]))
+
+    assert sink.received == [PAYLOAD]
+    assert queue.stats["retried"] == 2
+    assert queue.stats["dead_lettered"] == 0
+
+
+def test_dead_letter_after_max_attempts(fast_retries, fake_db):
+    """Test exhausted deliveries are written to the dead-letter collection"""
+    queue = NotificationQueue()
+    queue.register_sink(RecordingSink(failures=10))
+
+    asyncio.run(_run(queue, [PAYLOAD]))
+
+    dead_letters = list(fake_db[settings.notification_dead_letter_collection].docs.values())
+    assert len(dead_letters) == 1
+    assert dead_letters[0]["attempts"] == 3
+    assert dead_letters[0]["payload"] == PAYLOAD
+    assert dead_letters[0]["last_error"] == "sink unavailable"
+    assert dead_letters[0]["reason"] == "max_attempts"
+
+
+def test_dead_letter_when_queue_full(fast_retries, fake_db, monkeypatch):
+    """Test jobs rejected by a full sink queue are dead-lettered, not lost"""
+    monkeypatch.setattr(settings, "notification_queue_size", 1)
+    monkeypatch.setattr(settings, "notification_sink_concurrency", 1)
+    queue = NotificationQueue()
+    sink = RecordingSink(delay=0.05)
+    queue.register_sink(sink)
+
+    async def run():
+        queue.start()
+        for _ in range(3):
+            queue.enqueue(PAYLOAD)
+        await queue.stop()
+
+    asyncio.run(run())
+
+    dead_letters = list(fake_db[settings.notification_dead_letter_collection].docs.values())
+    # Workers have not picked anything up yet, so only one job fits in the queue
+    assert sink.received == [PAYLOAD]
+    assert [d["reason"] for d in dead_letters] == ["queue_full", "queue_full"]
+    assert queue.stats["dropped"] == 2
+
+
+def test_dead_letter_pending_retries_on_stop(fast_retries, fake_db, monkeypatch):
+    """Test jobs waiting to retry at shutdown are dead-lettered"""
+    monkeypatch.setattr(settings, "notification_backoff_base_seconds", 60)
+    monkeypatch.setattr(settings, "notification_backoff_max_seconds", 60)
+    queue = NotificationQueue()
+    queue.register_sink(RecordingSink(failures=1))
+
+    asyncio.run(_run(queue, [PAYLOAD], settle=0.05))
+
+    dead_letters = list(fake_db[settings.notification_dead_letter_collection].docs.values())
+    assert len(dead_letters) == 1
+    assert dead_letters[0]["reason"] == "shutdown"
+    assert dead_letters[0]["attempts"] == 1
+
+
+def test_per_sink_concurrency_limit(fast_retries, monkeypatch):
+    """Test in-flight deliveries per sink are bounded"""
+    monkeypatch.setattr(settings, "notification_sink_concurrency", 2)
+    queue = NotificationQueue()
+    sink = RecordingSink(delay=0.01)
+    queue.register_sink(sink)
+
+    asyncio.run(_run(queue, [PAYLOAD] * 10))
+
+    assert len(sink.received) == 10
+    assert sink.max_in_flight == 2
+
+
+def test_slow_sink_does_not_block_others(fast_retries, monkeypatch):
+    """Test a slow sink does not delay deliveries to a fast one"""
+    monkeypatch.setattr(settings, "notification_sink_concurrency", 1)
+    queue = NotificationQueue()
+    slow = RecordingSink("slow", delay=1.0)
+    fast = RecordingSink("fast")
+    queue.register_sink(slow)
+    queue.register_sink(fast)
+
+    async def run():
+        queue.start()
+        for _ in range(5):
+            queue.enqueue(PAYLOAD)
+        await asyncio.sleep(0.1)
+        delivered = len(fast.received)
+        await queue.stop(timeout=0)
+        return delivered
+
+    assert asyncio.run(run()) == 5
+    assert slow.received == []
+
+
+def test_restart_does_not_duplicate_sinks(monkeypatch):
+    """Test configured sinks are registered once across startup cycles"""
+    queue = NotificationQueue()
+    monkeypatch.setattr(notifications, "notification_queue", queue)
+    monkeypatch.setattr(settings, "notification_webhook_urls", ["http://127.0.0.1:1/hook"])
+
+    async def cycle():
+        await start_notification_workers()
+        await stop_notification_workers()
+
+    asyncio.run(cycle())
+    asyncio.run(cycle())
+
+    assert [sink.name for sink in queue.sinks] == ["webhook:0:127.0.0.1"]
+
+
+def test_webhook_url_kept_out_of_dead_letters(fast_retries, fake_db, caplog):
+    """Test secret webhook URLs are not logged or stored with dead letters"""
+    url = "http://127.0.0.1:1/services/T000/B000/secret-token"
+    queue = NotificationQueue()
+    queue.register_sink(WebhookSink(url, timeout=0.5))
+
+    asyncio.run(_run(queue, [PAYLOAD], settle=0.5))
+
+    dead_letters = list(fake_db[settings.notification_dead_letter_collection].docs.values())
+    assert len(dead_letters) == 1
+    assert dead_letters[0]["sink"] == "webhook:0:127.0.0.1"
+    assert "secret-token" not in str(dead_letters[0])
+    assert "secret-token" not in caplog.text
+
+
+def test_register_sink_rejects_duplicate_and_unnamed_sinks():
+    """Test sink name clashes fail loudly instead of dropping a sink"""
+    class UnnamedSink(NotificationSink):
+        async def send(self, payload):
+            pass
+
+    queue = NotificationQueue()
+    sink = RecordingSink("a")
+    queue.register_sink(sink)
+    queue.register_sink(sink)
+    with pytest.raises(ValueError):
+        queue.register_sink(RecordingSink("a"))
+    with pytest.raises(ValueError):
+        queue.register_sink(UnnamedSink())
+    with pytest.raises(TypeError):
+        NotificationSink()
+    assert queue.sinks == [sink]
+
+
+def test_enqueue_without_workers_is_noop():
+    """Test enqueueing before workers start does not fail"""
+    queue = NotificationQueue()
+    queue.register_sink(RecordingSink())
+    queue.enqueue(PAYLOAD)
+    assert queue.stats["delivered"] == 0
+
+
+def test_webhook_sink_posts_json(fast_retries):
+    """Test webhook sink against a local HTTP stand-in"""
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers["Content-Length"])
+            received.append(json.loads(self.rfile.read(length)))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        queue = NotificationQueue()
+        queue.register_sink(WebhookSink(f"http://127.0.0.1:{server.server_port}/hook"))
+        asyncio.run(_run(queue, [PAYLOAD], settle=0.5))
+    finally:
+        server.shutdown()
+
+    assert received == [PAYLOAD]
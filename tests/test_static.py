@@ -1,6 +1,9 @@
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from app.config import settings
 from app.main import app
+from app.services.static_files import StaticFilesMiddleware, StaticRouteTable
 import os
 from pathlib import Path
 
@@ -63,4 +66,97 @@ def test_certification_serve():
 def test_certification_serve_invalid_path():
     """Test serving certification with invalid path"""
     response = client.get("/api/v1/static/certifications/../../../etc/passwd")
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+def test_static_direct_file():
+    """Test files are served under /static with validators"""
+    response = client.get("/static/certifications/react_1.jpg")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/jpeg"
+    assert "etag" in response.headers
+    assert "content-disposition" not in response.headers
+
+    expected = (Path(__file__).resolve().parent.parent / "app/static/certifications/react_1.jpg").read_bytes()
+    assert response.content == expected
+
+
+def test_certification_serve_existing():
+    """Test serving an existing certification through the API"""
+    response = client.get("/api/v1/static/certifications/react_1.jpg")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/jpeg"
+    assert response.headers["cache-control"] == "max-age=3600"
+    assert "attachment" in response.headers["content-disposition"]
+
+
+def test_static_conditional_get():
+    """Test a matching If-None-Match returns 304"""
+    etag = client.get("/static/certifications/react_1.jpg").headers["etag"]
+    response = client.get("/static/certifications/react_1.jpg", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_static_range_and_head():
+    """Test byte ranges and HEAD requests"""
+    full = client.get("/api/v1/resume").content
+
+    response = client.get("/api/v1/resume", headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == full[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(full)}"
+
+    response = client.head("/api/v1/resume")
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(full))
+    assert response.content == b""
+
+
+def test_static_route_table_fd_backed(tmp_path, monkeypatch):
+    """Test large files are served from a cached descriptor and traversal is impossible"""
+    (tmp_path / "certifications").mkdir()
+    data = os.urandom(200 * 1024)
+    (tmp_path / "certifications" / "big.png").write_bytes(data)
+    (tmp_path / "secret.txt").write_text("secret")
+    (tmp_path / "certifications" / "link.png").symlink_to(tmp_path / "secret.txt")
+
+    monkeypatch.setattr(settings, "static_memory_cache_max_bytes", 1024)
+    table = StaticRouteTable(tmp_path, "/api/v1")
+    try:
+        route = table.routes["/api/v1/static/certifications/big.png"]
+        assert route.file.content is None and route.file.fd is not None
+        assert "/api/v1/static/certifications/link.png" not in table.routes
+        assert "/api/v1/static/certifications/../secret.txt" not in table.routes
+        assert [c["filename"] for c in table.certifications()] == ["big.png"]
+
+        test_app = FastAPI()
+        test_app.add_middleware(StaticFilesMiddleware, table=table)
+        response = TestClient(test_app).get("/api/v1/static/certifications/big.png")
+        assert response.status_code == 200
+        assert response.content == data
+    finally:
+        table.close()
+
+
+def test_static_route_table_reopen(tmp_path, monkeypatch):
+    """Test a closed table serves nothing and reopens with fresh descriptors"""
+    (tmp_path / "certifications").mkdir()
+    data = os.urandom(4 * 1024)
+    (tmp_path / "certifications" / "big.png").write_bytes(data)
+
+    monkeypatch.setattr(settings, "static_memory_cache_max_bytes", 1024)
+    table = StaticRouteTable(tmp_path, "/api/v1")
+    test_app = FastAPI()
+    test_app.add_middleware(StaticFilesMiddleware, table=table)
+    test_client = TestClient(test_app)
+    try:
+        table.close()
+        assert table.routes == {}
+        assert test_client.get("/static/certifications/big.png").status_code == 404
+
+        table.open()
+        response = test_client.get("/static/certifications/big.png")
+        assert response.status_code == 200
+        assert response.content == data
+    finally:
+        table.close()
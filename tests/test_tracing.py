@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.services.tracing import (
+    Trace,
+    _current_trace,
+    flush_traces,
+    get_current_trace,
+    span,
+    traced,
+)
+
+client = TestClient(app)
+
+
+def test_no_server_timing_by_default():
+    """Test untraced requests carry no Server-Timing header"""
+    response = client.get("/api/v1/static/health")
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+
+def test_server_timing_header(monkeypatch):
+    """Test Server-Timing header includes route spans and total"""
+    monkeypatch.setattr(settings, "tracing_server_timing", True)
+    response = client.get("/api/v1/certifications")
+    assert response.status_code == 200
+
+    server_timing = response.headers["server-timing"]
+    assert "static.list;dur=" in server_timing
+    assert "total;dur=" in server_timing
+
+
+def test_server_timing_on_db_route(monkeypatch, fake_db):
+    """Test contact submission is broken down into stages"""
+    monkeypatch.setattr(settings, "tracing_server_timing", True)
+    contact_data = {
+        "name": "John Doe",
+        "email": "john@example.com",
+        "subject": "Test Subject",
+        "message": "This is a test message"
+    }
+    response = client.post("/api/v1/contact", json=contact_data)
+    assert response.status_code == 200
+
+    server_timing = response.headers["server-timing"]
+    for stage in ["contact.build_document", "db.insert_contact", "contact.submit"]:
+        assert f"{stage};dur=" in server_timing
+
+
+def test_sampled_trace_export(monkeypatch, tmp_path):
+    """Test sampled traces are exported as OTLP/JSON lines"""
+    export_path = tmp_path / "traces.ndjson"
+    monkeypatch.setattr(settings, "tracing_sample_rate", 1.0)
+    monkeypatch.setattr(settings, "tracing_export_path", str(export_path))
+
+    response = client.get("/api/v1/static/health")
+    assert response.status_code == 200
+    flush_traces()
+
+    payload = json.loads(export_path.read_text().splitlines()[0])
+    spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert spans[0]["name"] == "GET /api/v1/static/health"
+    assert all(s["traceId"] == spans[0]["traceId"] for s in spans)
+    assert "response.body" in [s["name"] for s in spans]
+
+
+def test_static_file_spans(monkeypatch, tmp_path):
+    """Test static file lookups and sends are traced"""
+    export_path = tmp_path / "traces.ndjson"
+    monkeypatch.setattr(settings, "tracing_sample_rate", 1.0)
+    monkeypatch.setattr(settings, "tracing_export_path", str(export_path))
+
+    response = client.get("/static/resume/resume.pdf")
+    assert response.status_code == 200
+    flush_traces()
+
+    payload = json.loads(export_path.read_text().splitlines()[0])
+    names = [s["name"] for s in payload["resourceSpans"][0]["scopeSpans"][0]["spans"]]
+    assert "static.lookup" in names
+    assert "static.send" in names
+
+
+def test_span_nesting():
+    """Test nested spans record their parent"""
+    trace = Trace(sampled=False)
+    token = _current_trace.set(trace)
+    try:
+        with span("outer"):
+            with span("inner"):
+                pass
+    finally:
+        _current_trace.reset(token)
+
+    inner, outer = trace.spans
+    assert (inner.name, outer.name) == ("inner", "outer")
+    assert inner.parent_id == outer.span_id
+    assert outer.parent_id == trace.root_id
+
+
+def test_span_without_trace_is_noop():
+    """Test spans and traced functions work outside a traced request"""
+    @traced("work")
+    async def work():
+        return 42
+
+    assert get_current_trace() is None
+    with span("untraced"):
+        pass
+    assert asyncio.run(work()) == 42